@@ -4,6 +4,8 @@ from functools import lru_cache
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+__all__ = ["Settings", "get_settings"]
+
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables"""
@@ -17,6 +19,7 @@ class Settings(BaseSettings):
     # Application
     app_name: str = "OpenQuest API"
     debug: bool = False
+    web_concurrency: int | None = None  # Uvicorn workers; defaults to CPU count
 
     # Supabase
     supabase_url: str | None = None
@@ -35,12 +38,17 @@ class Settings(BaseSettings):
     github_client_secret: str | None = None
     github_redirect_uri: str = "http://localhost:5173/auth/github/callback"
 
+    # User preferences
+    # seconds; 0 disables the per-worker cache (ranking reads only, no tokens)
+    user_preference_cache_ttl: int = 30
+
     # Redis (optional)
     redis_url: str | None = None
 
     # OpenRouter LLM
     openrouter_api_key: str | None = None
     openrouter_model: str = "anthropic/claude-3.5-sonnet"
+    llm_response_cache_ttl: int = 600  # seconds; 0 disables the generate_json cache
 
     # E2B Sandbox
     e2b_api_key: str | None = None
@@ -50,6 +58,10 @@ class Settings(BaseSettings):
     agent_max_turns: int = 5
     agent_max_tokens_per_tool: int = 8000
 
+    # Contribution analysis
+    contribution_analyze_max_concurrency: int = 4
+    contribution_analyze_queue_timeout: float = 10.0  # seconds
+
     @property
     def is_production(self) -> bool:
         return not self.debug
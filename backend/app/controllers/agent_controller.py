@@ -1,12 +1,19 @@
 """Agent Controller - SSE endpoints for agent operations"""
 
+import asyncio
+import contextlib
 import logging
 from collections.abc import AsyncGenerator
+from typing import TYPE_CHECKING, Annotated
 
-from fastapi import APIRouter, HTTPException, status
-from sse_starlette.sse import EventSourceResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 
-from ..dao.agent_session_dao import AgentSessionDAO
+from ..dao.agent_session_dao import (
+    DEFAULT_SESSION_LIMIT,
+    AgentSessionDAO,
+    AgentSessionRecord,
+)
 from ..dto.agent_dto import (
     AgentAnalyzeRequest,
     AgentDoneEvent,
@@ -17,26 +24,138 @@ from ..dto.agent_dto import (
     AgentSolutionEvent,
     DeleteSessionResponse,
     SessionResponse,
+    dump_event,
+)
+from ..utils.dependencies import (
+    CurrentUser,
+    SupabaseClient,
+    get_optional_openrouter_service,
 )
-from ..services.agent_service import AgentService
-from ..services.openrouter_service import OpenRouterService
-from ..utils.dependencies import CurrentUser
-from ..utils.supabase_client import get_supabase_client
+
+if TYPE_CHECKING:
+    # Imported lazily at request time: agent_service pulls in the E2B SDK
+    from ..services.agent_service import AgentService
 
 router = APIRouter(prefix="/agent", tags=["Agent"])
 logger = logging.getLogger("agent")
 
 
-def get_session_dao() -> AgentSessionDAO:
-    """Get AgentSessionDAO instance"""
-    return AgentSessionDAO(get_supabase_client())
+# The done event never changes, so encode it once at import time
+_DONE_PAYLOAD = dump_event(AgentDoneEvent())
+
+_SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",  # Disable nginx buffering
+}
+
+
+# Idle streams get an SSE comment line so proxies don't drop the connection
+_SSE_PING_INTERVAL = 15.0
+_SSE_PING = b": ping\n\n"
+
+
+async def _sse_stream(
+    events: AsyncGenerator[dict, None],
+) -> AsyncGenerator[bytes, None]:
+    """
+    Frame event dicts as SSE messages.
+
+    Payloads are already single-line JSON bytes, so framing is a bytes concat
+    with no re-encoding.
+    A keep-alive comment is sent whenever no event arrives within
+    _SSE_PING_INTERVAL seconds.
+    """
+    next_event = asyncio.ensure_future(anext(events))
+    try:
+        while True:
+            done, _ = await asyncio.wait({next_event}, timeout=_SSE_PING_INTERVAL)
+            if not done:
+                yield _SSE_PING
+                continue
+
+            try:
+                event = next_event.result()
+            except StopAsyncIteration:
+                return
+
+            yield b"event: %s\ndata: %s\n\n" % (event["event"].encode(), event["data"])
+            next_event = asyncio.ensure_future(anext(events))
+    finally:
+        # Client disconnected mid-wait: stop the generator so its cleanup runs
+        if not next_event.done():
+            next_event.cancel()
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await next_event
+        await events.aclose()
+
+
+def _error_event(exc: Exception, prefix: str = "") -> dict:
+    """Log a stream failure and translate it into an SSE error event"""
+    logger.error("[SSE] %s%s: %s", prefix, type(exc).__name__, exc, exc_info=True)
+    return {
+        "event": "error",
+        "data": dump_event(AgentErrorEvent(message=f"{prefix}{exc}")),
+    }
+
+
+def get_session_dao(supabase: SupabaseClient) -> AgentSessionDAO:
+    """Get an AgentSessionDAO bound to the shared async Supabase client"""
+    return AgentSessionDAO(supabase)
+
+
+SessionDAO = Annotated[AgentSessionDAO, Depends(get_session_dao)]
+
+
+def get_agent_service() -> "AgentService":
+    """
+    Get an AgentService bound to the shared OpenRouterService.
+
+    AgentService owns the E2B sandbox of a single run, so a new instance is
+    created per request; only the stateless LLM client is reused.
+
+    Raises:
+        ValueError: If no OpenRouter API key is configured
+    """
+    from ..services.agent_service import AgentService
+
+    openrouter = get_optional_openrouter_service()
+    if openrouter is None:
+        raise ValueError("OpenRouter API key is required")
+    return AgentService(openrouter)
+
+
+async def _get_unavailable_session(
+    session_dao: AgentSessionDAO, session_id: str, user_id: str
+) -> AgentSessionRecord:
+    """
+    Explain why AgentSessionDAO.acquire() returned nothing.
+
+    Raises 404 if the session does not exist and 403 if it belongs to another
+    user; otherwise returns the (expired) session.
+    """
+    session = await session_dao.get(session_id)
+    if not session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Session not found",
+        )
+
+    if session.user_id != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Session does not belong to current user",
+        )
+
+    return session
 
 
 @router.post("/analyze")
 async def analyze_issue(
     request: AgentAnalyzeRequest,
     current_user: CurrentUser,
-) -> EventSourceResponse:
+    session_dao: SessionDAO,
+) -> StreamingResponse:
     """
     Analyze a GitHub issue and stream results via SSE.
 
@@ -62,12 +181,12 @@ async def analyze_issue(
     Args:
         request: Analysis request containing repo URL and issue details
         current_user: Authenticated user (from JWT token)
+        session_dao: Agent session DAO
 
     Returns:
-        EventSourceResponse streaming agent events
+        StreamingResponse streaming agent events
     """
     user_id = str(current_user["id"])
-    session_dao = get_session_dao()
 
     logger.info(
         "Starting issue analysis",
@@ -84,117 +203,94 @@ async def analyze_issue(
         solution_data: dict | None = None
         event_count = 0
 
-        logger.info(f"[SSE] Starting event generator for user {user_id}")
+        logger.info("[SSE] Starting event generator", extra={"user_id": user_id})
 
         try:
             # Initialize agent service
-            logger.info("[SSE] Initializing OpenRouterService...")
-            openrouter = OpenRouterService()
-            logger.info("[SSE] OpenRouterService initialized")
-
-            logger.info("[SSE] Initializing AgentService...")
-            agent = AgentService(openrouter)
-            logger.info("[SSE] AgentService initialized")
+            logger.debug("[SSE] Initializing AgentService...")
+            agent = get_agent_service()
+            logger.debug("[SSE] AgentService initialized")
 
             # Stream events from agent
-            logger.info("[SSE] Starting to stream events from agent...")
+            logger.debug("[SSE] Starting to stream events from agent...")
             async for event in agent.analyze_issue_stream(request):
                 event_count += 1
-                logger.info(f"[SSE] Received event #{event_count}: type={event.type}")
+                logger.debug(
+                    "[SSE] Received event #%d: type=%s", event_count, event.type
+                )
 
                 # Intercept solution event to save to database
                 if event.type == "solution":
-                    logger.info("[SSE] Processing solution event")
+                    logger.debug("[SSE] Processing solution event")
                     solution_data = event.data
-                    logger.info(
-                        f"[SSE] Solution data keys: {list(solution_data.keys()) if solution_data else 'None'}"
-                    )
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(
+                            "[SSE] Solution data keys: %s",
+                            list(solution_data.keys()) if solution_data else None,
+                        )
 
                     # Save session to Supabase
                     try:
-                        logger.info("[SSE] Attempting to save session to database...")
-                        session_id = session_dao.create(
+                        logger.debug("[SSE] Attempting to save session to database...")
+                        session_id = await session_dao.create(
                             user_id=user_id,
                             repo_url=request.repo_url,
                             issue_number=request.issue_number,
                             issue_title=request.issue_title,
                             solution=solution_data,
                         )
-                        logger.info(f"[SSE] Session saved successfully: {session_id}")
+                        logger.debug("[SSE] Session saved successfully: %s", session_id)
                     except Exception as e:
-                        import traceback
-
                         logger.error(
-                            f"[SSE] Failed to save session: {type(e).__name__}: {e}"
+                            "[SSE] Failed to save session: %s: %s",
+                            type(e).__name__,
+                            e,
+                            exc_info=True,
                         )
-                        logger.error(f"[SSE] Traceback: {traceback.format_exc()}")
                         # Still yield the solution even if session save fails
                         session_id = None
 
                     # Yield solution with session_id
-                    event_data = AgentSolutionEvent(
-                        session_id=session_id,
-                        data=solution_data,
-                    ).model_dump_json()
-                    logger.info(
-                        f"[SSE] Yielding solution event (session_id={session_id})"
+                    event_data = dump_event(
+                        AgentSolutionEvent(session_id=session_id, data=solution_data)
+                    )
+                    logger.debug(
+                        "[SSE] Yielding solution event (session_id=%s)", session_id
                     )
                     yield {
                         "event": "solution",
                         "data": event_data,
                     }
                 else:
-                    event_data = event.model_dump_json()
-                    logger.debug(f"[SSE] Yielding event: type={event.type}")
+                    event_data = dump_event(event)
+                    logger.debug("[SSE] Yielding event: type=%s", event.type)
                     yield {
                         "event": event.type,
                         "data": event_data,
                     }
 
-            logger.info(f"[SSE] Finished streaming events. Total events: {event_count}")
-
-        except ValueError as e:
-            # Configuration errors (missing API keys, etc.)
-            import traceback
-
-            logger.error(f"[SSE] Configuration error: {e}")
-            logger.error(f"[SSE] Traceback: {traceback.format_exc()}")
-            yield {
-                "event": "error",
-                "data": AgentErrorEvent(
-                    message=f"Configuration error: {e}"
-                ).model_dump_json(),
-            }
+            logger.info(
+                "[SSE] Finished streaming events",
+                extra={"user_id": user_id, "event_count": event_count},
+            )
 
         except Exception as e:
-            # Unexpected errors
-            import traceback
-
-            logger.error(
-                f"[SSE] Unexpected error during analysis: {type(e).__name__}: {e}"
-            )
-            logger.error(f"[SSE] Traceback: {traceback.format_exc()}")
-            yield {
-                "event": "error",
-                "data": AgentErrorEvent(message=str(e)).model_dump_json(),
-            }
+            # ValueError signals configuration errors (missing API keys, etc.)
+            prefix = "Configuration error: " if isinstance(e, ValueError) else ""
+            yield _error_event(e, prefix)
 
         finally:
             # Always send done event
-            logger.info("[SSE] Sending done event and cleaning up")
+            logger.debug("[SSE] Sending done event and cleaning up")
             yield {
                 "event": "done",
-                "data": AgentDoneEvent().model_dump_json(),
+                "data": _DONE_PAYLOAD,
             }
 
-    return EventSourceResponse(
-        event_generator(),
+    return StreamingResponse(
+        _sse_stream(event_generator()),
         media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",  # Disable nginx buffering
-        },
+        headers=_SSE_HEADERS,
     )
 
 
@@ -202,7 +298,8 @@ async def analyze_issue(
 async def implement_solution(
     request: AgentImplementRequest,
     current_user: CurrentUser,
-) -> EventSourceResponse:
+    session_dao: SessionDAO,
+) -> StreamingResponse:
     """
     Implement the solution from a previous analysis.
 
@@ -227,43 +324,25 @@ async def implement_solution(
     Args:
         request: Implement request with session_id and branch name
         current_user: Authenticated user (from JWT token)
+        session_dao: Agent session DAO
 
     Returns:
-        EventSourceResponse streaming implementation events
+        StreamingResponse streaming implementation events
     """
     user_id = str(current_user["id"])
-    session_dao = get_session_dao()
 
-    # Get session from database
-    session = session_dao.get(request.session_id)
+    # Verify ownership, reset TTL and mark as implementing in one call
+    session = await session_dao.acquire(request.session_id, user_id, "implementing")
     if not session:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Session not found",
-        )
-
-    # Verify session belongs to user
-    if session.user_id != user_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Session does not belong to current user",
-        )
+        await _get_unavailable_session(session_dao, request.session_id, user_id)
 
-    # Check if session is expired
-    if session.is_expired:
-        # Mark as expired in database
-        session_dao.set_status(request.session_id, "expired")
+        # Session exists and belongs to user, so it has expired
+        await session_dao.set_status(request.session_id, "expired")
         raise HTTPException(
             status_code=status.HTTP_410_GONE,
             detail="Session has expired. Please analyze the issue again.",
         )
 
-    # Update last_accessed_at to reset TTL
-    session_dao.update_last_accessed(request.session_id)
-
-    # Mark as implementing
-    session_dao.set_status(request.session_id, "implementing")
-
     logger.info(
         "Starting implementation",
         extra={
@@ -277,7 +356,7 @@ async def implement_solution(
         success = False
         try:
             # Create a fresh agent service (will create new sandbox)
-            agent = AgentService()
+            agent = get_agent_service()
 
             # Stream implementation events
             async for event in agent.implement_solution_stream(
@@ -287,9 +366,10 @@ async def implement_solution(
                 github_token=request.github_token,
                 commit_message=request.commit_message,
             ):
+                logger.debug("[SSE] Yielding event: type=%s", event.type)
                 yield {
                     "event": event.type,
-                    "data": event.model_dump_json(),
+                    "data": dump_event(event),
                 }
 
                 # Check if this was a successful result
@@ -300,29 +380,24 @@ async def implement_solution(
             logger.error("Implementation failed", extra={"error": str(e)})
             yield {
                 "event": "error",
-                "data": AgentErrorEvent(message=str(e)).model_dump_json(),
+                "data": dump_event(AgentErrorEvent(message=str(e))),
             }
 
         finally:
-            # Update session status based on result
-            if success:
-                session_dao.set_status(request.session_id, "completed")
-            else:
-                session_dao.set_status(request.session_id, "failed")
+            # Single terminal write; "implementing" was set by acquire()
+            await session_dao.set_status(
+                request.session_id, "completed" if success else "failed"
+            )
 
             yield {
                 "event": "done",
-                "data": AgentDoneEvent().model_dump_json(),
+                "data": _DONE_PAYLOAD,
             }
 
-    return EventSourceResponse(
-        event_generator(),
+    return StreamingResponse(
+        _sse_stream(event_generator()),
         media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",  # Disable nginx buffering
-        },
+        headers=_SSE_HEADERS,
     )
 
 
@@ -330,6 +405,7 @@ async def implement_solution(
 async def get_session(
     session_id: str,
     current_user: CurrentUser,
+    session_dao: SessionDAO,
 ) -> SessionResponse:
     """
     Get information about an agent session.
@@ -339,28 +415,18 @@ async def get_session(
     Args:
         session_id: The session ID
         current_user: Authenticated user
+        session_dao: Agent session DAO
 
     Returns:
         Session information including repo URL and expiry time
     """
     user_id = str(current_user["id"])
-    session_dao = get_session_dao()
 
-    session = session_dao.get(session_id)
+    # Verify ownership and reset TTL in one call
+    session = await session_dao.acquire(session_id, user_id)
     if not session:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Session not found",
-        )
-
-    if session.user_id != user_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Session does not belong to current user",
-        )
-
-    # Update last_accessed_at to reset TTL
-    session_dao.update_last_accessed(session_id)
+        # Expired sessions are still reported, but their TTL is not reset
+        session = await _get_unavailable_session(session_dao, session_id, user_id)
 
     return SessionResponse(
         session_id=session_id,
@@ -378,6 +444,7 @@ async def get_session(
 async def delete_session(
     session_id: str,
     current_user: CurrentUser,
+    session_dao: SessionDAO,
 ) -> DeleteSessionResponse:
     """
     Delete an agent session.
@@ -385,75 +452,79 @@ async def delete_session(
     Args:
         session_id: The session ID
         current_user: Authenticated user
+        session_dao: Agent session DAO
 
     Returns:
         Confirmation message
+
+    Raises:
+        404: If the session does not exist
+        403: If the session belongs to another user
+        500: If the session exists but could not be deleted
     """
     user_id = str(current_user["id"])
-    session_dao = get_session_dao()
 
-    session = session_dao.get(session_id)
-    if not session:
+    # Only deletes if the session belongs to the user
+    if not await session_dao.delete(session_id, user_id):
+        # Raises 404/403 when the delete was refused for a reason
+        await _get_unavailable_session(session_dao, session_id, user_id)
+        # The user's session is still there: the delete itself failed
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Session not found",
-        )
-
-    if session.user_id != user_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Session does not belong to current user",
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to delete session",
         )
 
-    session_dao.delete(session_id)
-
     return DeleteSessionResponse(message="Session deleted successfully")
 
 
-@router.get("/sessions")
-async def list_sessions(current_user: CurrentUser) -> list[SessionResponse]:
+@router.get("/sessions", response_model=list[SessionResponse])
+async def list_sessions(
+    current_user: CurrentUser,
+    session_dao: SessionDAO,
+    limit: int = Query(
+        default=DEFAULT_SESSION_LIMIT,
+        ge=1,
+        le=100,
+        description="Number of sessions to return",
+    ),
+    offset: int = Query(default=0, ge=0, description="Number of sessions to skip"),
+) -> list[dict]:
     """
-    List all sessions for the current user.
+    List the current user's sessions, newest first.
 
     Args:
         current_user: Authenticated user
+        session_dao: Agent session DAO
+        limit: Number of sessions to return (default: 50)
+        offset: Number of sessions to skip
 
     Returns:
         List of session info
     """
     user_id = str(current_user["id"])
-    session_dao = get_session_dao()
-
-    sessions = session_dao.get_by_user(user_id)
-
-    return [
-        SessionResponse(
-            session_id=s.id,
-            repo_url=s.repo_url,
-            issue_number=s.issue_number,
-            issue_title=s.issue_title,
-            created_at=s.created_at.isoformat(),
-            expires_at=s.expires_at.isoformat(),
-            status=s.status,
-            solution_summary=s.solution.get("summary", ""),
-        )
-        for s in sessions
-    ]
+
+    # Rows already match SessionResponse; the response_model validates them once
+    return await session_dao.list_summaries(user_id, limit, offset)
 
 
 @router.post("/sessions/cleanup")
-async def cleanup_expired_sessions(current_user: CurrentUser) -> dict:
+async def cleanup_expired_sessions(
+    current_user: CurrentUser, session_dao: SessionDAO
+) -> dict:
     """
     Clean up expired sessions (admin/maintenance endpoint).
 
+    Expired sessions are also deleted every 5 minutes by a pg_cron job
+    (migration 009); this endpoint only forces an immediate run.
+
     Args:
         current_user: Authenticated user
+        session_dao: Agent session DAO
 
     Returns:
         Number of sessions cleaned up
     """
-    session_dao = get_session_dao()
-    count = session_dao.cleanup_expired()
+    count = await session_dao.cleanup_expired()
 
     logger.info("Cleaned up expired sessions", extra={"count": count})
 
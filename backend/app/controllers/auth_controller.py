@@ -1,8 +1,11 @@
 """Authentication Controller - /auth/* Routes"""
 
+import hashlib
 import logging
+from datetime import datetime
+from operator import attrgetter
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
 from ..dao.user_preference_dao import UserPreferenceDAO
@@ -15,12 +18,48 @@ from ..dto.user_dto import (
     UserPreferenceUpdateDTO,
 )
 from ..services.auth_service import AuthService
-from ..utils.dependencies import CurrentUser, SupabaseClient
+from ..utils.dependencies import (
+    CurrentUser,
+    SupabaseClient,
+    invalidate_cached_user,
+)
+from ..utils.streaming import json_model_response
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 security = HTTPBearer()
 
+_enum_value = attrgetter("value")
+
+
+def _preferences_etag(updated_at: datetime | None) -> str | None:
+    """Derive a strong ETag from a preferences row's updated_at timestamp"""
+    if updated_at is None:
+        return None
+    digest = hashlib.blake2b(updated_at.isoformat().encode(), digest_size=8)
+    return f'"{digest.hexdigest()}"'
+
+
+def _serialize_preferences(
+    data: UserPreferenceCreateDTO | UserPreferenceUpdateDTO,
+) -> dict:
+    """
+    Convert skills and interest enums to their stored (plain JSON) form.
+
+    Fields that are None (not provided in a partial update) stay None.
+    """
+    return {
+        "skills": None
+        if data.skills is None
+        else [skill.to_dict() for skill in data.skills],
+        "project_interests": None
+        if data.project_interests is None
+        else list(map(_enum_value, data.project_interests)),
+        "issue_interests": None
+        if data.issue_interests is None
+        else list(map(_enum_value, data.issue_interests)),
+    }
+
 
 @router.post(
     "/register", response_model=UserResponseDTO, status_code=status.HTTP_201_CREATED
@@ -38,7 +77,7 @@ async def register(data: RegisterDTO, supabase: SupabaseClient) -> UserResponseD
     """
     try:
         auth_service = AuthService(supabase)
-        return auth_service.register(data)
+        return await auth_service.register(data)
     except ValueError as e:
         # Validation errors (password too short, email already exists, etc.)
         raise HTTPException(
@@ -47,7 +86,7 @@ async def register(data: RegisterDTO, supabase: SupabaseClient) -> UserResponseD
         )
     except Exception as e:
         # Log the full error for debugging
-        logger.error(f"Registration error: {e}", exc_info=True)
+        logger.error("Registration error: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Registration failed: {str(e)}",
@@ -59,7 +98,7 @@ async def login(data: LoginDTO, supabase: SupabaseClient) -> TokenDTO:
     """Login and get access token"""
     try:
         auth_service = AuthService(supabase)
-        return auth_service.login(data)
+        return await auth_service.login(data)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
     except Exception as e:
@@ -75,15 +114,16 @@ async def logout(
     supabase: SupabaseClient = None,
 ) -> None:
     """Logout current user"""
+    invalidate_cached_user(credentials.credentials)
     auth_service = AuthService(supabase)
-    auth_service.logout(credentials.credentials)
+    await auth_service.logout(credentials.credentials)
 
 
 @router.get("/me", response_model=UserResponseDTO)
 async def get_current_user_info(current_user: CurrentUser) -> UserResponseDTO:
     """Get current user information"""
     return UserResponseDTO(
-        id=str(current_user["id"]),
+        id=current_user["id"],
         email=current_user["email"],
         created_at=current_user.get("created_at"),
     )
@@ -94,7 +134,8 @@ async def get_current_user_info(current_user: CurrentUser) -> UserResponseDTO:
 async def get_user_preferences(
     current_user: CurrentUser,
     supabase: SupabaseClient,
-) -> UserPreferenceDTO:
+    if_none_match: str | None = Header(default=None),
+) -> UserPreferenceDTO | Response:
     """
     Get current user's preferences.
 
@@ -104,14 +145,23 @@ async def get_user_preferences(
     - Project interests (webapp, mobile, etc.)
     - Issue interests (bug_fix, feature, etc.)
 
+    The response carries an ETag derived from updated_at; sending it back in
+    If-None-Match returns 304 after fetching only the timestamp.
+
     Raises 404 if preferences have not been set yet.
     """
-    from uuid import UUID
-
     try:
-        user_id = UUID(str(current_user["id"]))
+        user_id = current_user["id"]
         dao = UserPreferenceDAO(supabase)
-        preference = dao.get_by_user_id(user_id)
+
+        if if_none_match:
+            etag = _preferences_etag(await dao.get_version(user_id))
+            if etag and etag in {tag.strip() for tag in if_none_match.split(",")}:
+                return Response(
+                    status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+                )
+
+        preference = await dao.get_by_user_id(user_id)
 
         if not preference:
             raise HTTPException(
@@ -119,7 +169,11 @@ async def get_user_preferences(
                 detail="User preferences not found. Please create preferences first.",
             )
 
-        return UserPreferenceDTO.from_model(preference)
+        etag = _preferences_etag(preference.updated_at)
+        return json_model_response(
+            UserPreferenceDTO.from_model(preference),
+            headers={"ETag": etag} if etag else None,
+        )
     except HTTPException:
         raise
     except ValueError as e:
@@ -163,13 +217,11 @@ async def create_user_preferences(
       "skills": [
         {
           "name": "python",
-          "familiarity": "beginner",
-          "category": "programming_language"
+          "familiarity": "beginner"
         },
         {
           "name": "react",
-          "familiarity": "intermediate",
-          "category": "framework"
+          "familiarity": "intermediate"
         }
       ],
       "project_interests": ["webapp", "api"],
@@ -179,45 +231,40 @@ async def create_user_preferences(
 
     **Note:** If preferences already exist, returns 409 Conflict. Use PUT to update existing preferences.
     """
-    from uuid import UUID
-
     try:
-        user_id = UUID(str(current_user["id"]))
+        user_id = current_user["id"]
         dao = UserPreferenceDAO(supabase)
 
-        # Check if preferences already exist
-        existing = dao.get_by_user_id(user_id)
-        if existing:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="User preferences already exist. Use PUT /me/preferences to update.",
-            )
-
-        # Convert SkillInputDTO to dict format for storage
-        skills_data = [skill.to_skill().to_dict() for skill in data.skills]
-
-        # Convert enums to string values
-        project_interests = [p.value for p in data.project_interests]
-        issue_interests = [i.value for i in data.issue_interests]
-
         # Create new preferences (include GitHub token if provided during onboarding)
-        preference = dao.create_or_update(
+        preference = await dao.insert_if_absent(
             user_id=user_id,
             languages=data.languages,
-            skills=skills_data,
-            project_interests=project_interests,
-            issue_interests=issue_interests,
+            **_serialize_preferences(data),
             user_name=data.user_name,
             github_token=data.github_token,
             github_username=data.github_username,
         )
 
-        logger.info(
-            f"Created preferences for user {user_id}"
-            + (f" with GitHub @{data.github_username}" if data.github_username else "")
-        )
+        # None means a row for this user already exists (unique user_id)
+        if preference is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="User preferences already exist. Use PUT /me/preferences to update.",
+            )
 
-        return UserPreferenceDTO.from_model(preference)
+        if data.github_username:
+            logger.info(
+                "Created preferences for user %s with GitHub @%s",
+                user_id,
+                data.github_username,
+            )
+        else:
+            logger.info("Created preferences for user %s", user_id)
+
+        return json_model_response(
+            UserPreferenceDTO.from_model(preference),
+            status_code=status.HTTP_201_CREATED,
+        )
 
     except HTTPException:
         raise
@@ -265,76 +312,40 @@ async def update_user_preferences(
       "skills": [
         {
           "name": "python",
-          "familiarity": "intermediate",
-          "category": "programming_language"
+          "familiarity": "intermediate"
         }
       ]
     }
     ```
     """
-    from uuid import UUID
+    # Reject a no-op PUT before any conversion or Supabase I/O
+    has_updates = (
+        data.user_name is not None
+        or data.languages is not None
+        or data.skills is not None
+        or data.project_interests is not None
+        or data.issue_interests is not None
+    )
+    if not has_updates:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="At least one field must be provided for update.",
+        )
 
     try:
-        user_id = UUID(str(current_user["id"]))
+        user_id = current_user["id"]
         dao = UserPreferenceDAO(supabase)
+        serialized = _serialize_preferences(data)
 
-        # Check if at least one field is provided for update
-        has_updates = (
-            data.user_name is not None
-            or data.languages is not None
-            or data.skills is not None
-            or data.project_interests is not None
-            or data.issue_interests is not None
-        )
-
-        if not has_updates:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="At least one field must be provided for update.",
-            )
-
-        # Convert SkillInputDTO to dict format if provided
-        skills_data = (
-            [skill.to_skill().to_dict() for skill in data.skills]
-            if data.skills is not None
-            else None
-        )
-
-        # Convert enums to string values if provided
-        project_interests = (
-            [p.value for p in data.project_interests]
-            if data.project_interests is not None
-            else None
-        )
-        issue_interests = (
-            [i.value for i in data.issue_interests]
-            if data.issue_interests is not None
-            else None
-        )
-
-        # Try partial update first
-        preference = dao.update_partial(
+        # Single upsert: updates provided fields, or creates the row if missing
+        preference = await dao.upsert_partial(
             user_id=user_id,
             user_name=data.user_name,
             languages=data.languages,
-            skills=skills_data,
-            project_interests=project_interests,
-            issue_interests=issue_interests,
+            **serialized,
         )
 
-        # If preferences don't exist, create new ones with provided data
-        if preference is None:
-            preference = dao.create_or_update(
-                user_id=user_id,
-                languages=data.languages if data.languages is not None else [],
-                skills=skills_data if skills_data is not None else [],
-                project_interests=project_interests
-                if project_interests is not None
-                else [],
-                issue_interests=issue_interests if issue_interests is not None else [],
-            )
-
-        return UserPreferenceDTO.from_model(preference)
+        return json_model_response(UserPreferenceDTO.from_model(preference))
 
     except HTTPException:
         raise
@@ -362,24 +373,24 @@ async def get_github_status(
     Returns whether the user has connected their GitHub account
     and their GitHub username if connected.
     """
-    from uuid import UUID
-
     try:
-        user_id = UUID(str(current_user["id"]))
-        logger.info(f"[GitHub] Checking GitHub status for user: {user_id}")
+        user_id = current_user["id"]
+        logger.debug("[GitHub] Checking GitHub status for user: %s", user_id)
 
         dao = UserPreferenceDAO(supabase)
-        preference = dao.get_by_user_id(user_id)
+        preference = await dao.get_by_user_id(user_id)
 
         if not preference:
-            logger.info(f"[GitHub] No preferences found for user: {user_id}")
+            logger.info("[GitHub] No preferences found for user: %s", user_id)
             return GitHubStatusDTO(connected=False)
 
         has_token = preference.github_token is not None
-        logger.info(
-            f"[GitHub] User {user_id}: connected={has_token}, "
-            f"username={preference.github_username}, "
-            f"token_present={bool(preference.github_token)}"
+        logger.debug(
+            "[GitHub] User %s: connected=%s, username=%s, token_present=%s",
+            user_id,
+            has_token,
+            preference.github_username,
+            bool(preference.github_token),
         )
 
         return GitHubStatusDTO(
@@ -387,7 +398,7 @@ async def get_github_status(
             username=preference.github_username,
         )
     except Exception as e:
-        logger.error(f"[GitHub] Error getting status: {e}")
+        logger.error("[GitHub] Error getting status: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to get GitHub status: {str(e)}",
@@ -409,14 +420,12 @@ async def connect_github(
     - `access_token`: GitHub OAuth access token
     - `username`: GitHub username
     """
-    from uuid import UUID
-
     try:
-        user_id = UUID(str(current_user["id"]))
+        user_id = current_user["id"]
         dao = UserPreferenceDAO(supabase)
 
         # Update or create preferences with GitHub token
-        preference = dao.update_github(
+        preference = await dao.update_github(
             user_id=user_id,
             github_token=data.access_token,
             github_username=data.username,
@@ -424,7 +433,7 @@ async def connect_github(
 
         if not preference:
             # Create preferences if they don't exist
-            preference = dao.create_or_update(
+            preference = await dao.create_or_update(
                 user_id=user_id,
                 languages=[],
                 skills=[],
@@ -434,14 +443,14 @@ async def connect_github(
                 github_username=data.username,
             )
 
-        logger.info(f"GitHub connected for user {user_id}: @{data.username}")
+        logger.info("GitHub connected for user %s: @%s", user_id, data.username)
 
         return GitHubStatusDTO(
             connected=True,
             username=data.username,
         )
     except Exception as e:
-        logger.error(f"Failed to connect GitHub: {e}", exc_info=True)
+        logger.error("Failed to connect GitHub: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to connect GitHub: {str(e)}",
@@ -458,19 +467,17 @@ async def disconnect_github(
 
     Removes the stored GitHub OAuth token.
     """
-    from uuid import UUID
-
     try:
-        user_id = UUID(str(current_user["id"]))
+        user_id = current_user["id"]
         dao = UserPreferenceDAO(supabase)
 
-        dao.update_github(
+        await dao.update_github(
             user_id=user_id,
             github_token=None,
             github_username=None,
         )
 
-        logger.info(f"GitHub disconnected for user {user_id}")
+        logger.info("GitHub disconnected for user %s", user_id)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -491,12 +498,10 @@ async def get_github_token(
 
     **Note:** Only returns the token if connected. Returns 404 if not connected.
     """
-    from uuid import UUID
-
     try:
-        user_id = UUID(str(current_user["id"]))
+        user_id = current_user["id"]
         dao = UserPreferenceDAO(supabase)
-        preference = dao.get_by_user_id(user_id)
+        preference = await dao.get_by_user_id(user_id)
 
         if not preference or not preference.github_token:
             raise HTTPException(
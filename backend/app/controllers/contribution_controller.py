@@ -1,24 +1,40 @@
 """Contribution Analysis Controller - /contributions/* Routes"""
 
+import asyncio
 import logging
+from typing import Annotated
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 
+from ..config import get_settings
 from ..dto.contribution_dto import (
     ContributionAnalysisDTO,
     ContributionAnalysisQueryDTO,
 )
 from ..services.contribution_service import ContributionService
 from ..utils.dependencies import CurrentUser
+from ..utils.streaming import json_model_response
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/contributions", tags=["Contributions"])
 
+# Analysis is long-running; bound how many run at once per worker
+_analyze_semaphore = asyncio.Semaphore(
+    get_settings().contribution_analyze_max_concurrency
+)
+
+
+def get_contribution_service(request: Request) -> ContributionService:
+    """Get the ContributionService built at startup"""
+    service = getattr(request.app.state, "contribution_service", None)
+    return service if service is not None else ContributionService()
+
 
 @router.post("/analyze", response_model=ContributionAnalysisDTO)
 async def analyze_contributions(
     query: ContributionAnalysisQueryDTO,
     current_user: CurrentUser,  # Require authentication
+    service: Annotated[ContributionService, Depends(get_contribution_service)],
 ) -> ContributionAnalysisDTO:
     """
     Analyze repository contributions and generate heatmap data.
@@ -38,21 +54,38 @@ async def analyze_contributions(
     - Contributor specializations (top 3 modules per contributor)
     - Summary statistics
     """
+    settings = get_settings()
+    try:
+        await asyncio.wait_for(
+            _analyze_semaphore.acquire(),
+            timeout=settings.contribution_analyze_queue_timeout,
+        )
+    except TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many contribution analyses in progress. Please retry shortly.",
+            headers={
+                "Retry-After": str(int(settings.contribution_analyze_queue_timeout))
+            },
+        )
+
     try:
-        service = ContributionService()
         analysis = await service.analyze_repository(
             repo_url=query.repo_url, days_back=query.days_back
         )
 
-        return ContributionAnalysisDTO(**analysis)
+        # Validated once against the DTO, then written straight to JSON bytes
+        return json_model_response(ContributionAnalysisDTO.model_validate(analysis))
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e),
         )
     except Exception as e:
-        logger.error(f"Failed to analyze contributions: {e}", exc_info=True)
+        logger.error("Failed to analyze contributions: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
             detail=f"Failed to analyze repository contributions: {str(e)}",
         )
+    finally:
+        _analyze_semaphore.release()
@@ -1,18 +1,22 @@
 """GitHub OAuth Controller - OAuth endpoints for GitHub authentication"""
 
+import asyncio
+import hashlib
 import logging
-import traceback
+import re
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from cachetools import TTLCache
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from pydantic import BaseModel, Field
+from supabase import AsyncClient
 
 from ..dao.user_preference_dao import UserPreferenceDAO
 from ..services.github_oauth_service import GitHubOAuthService
+from ..utils.dependencies import SupabaseClient, parse_uuid
 from ..utils.exceptions import GitHubOAuthError
-from ..utils.supabase_client import get_supabase_client
 
 router = APIRouter(prefix="/oauth", tags=["OAuth"])
 logger = logging.getLogger("oauth")
@@ -20,10 +24,52 @@ logger = logging.getLogger("oauth")
 # Optional bearer token for detecting logged-in users
 security = HTTPBearer(auto_error=False)
 
+# Frontends poll /github/validate on focus/reconnect; remember GitHub's recent
+# definitive answers (keyed by a digest of the token) so repeats skip the
+# round-trip. Outages and rate limits are never cached.
+VALIDATE_CACHE_TTL_SECONDS = 60
+_validate_cache: TTLCache = TTLCache(maxsize=10_000, ttl=VALIDATE_CACHE_TTL_SECONDS)
+
+# GitHub tokens are either prefixed (gho_, ghp_, github_pat_, ...) or legacy 40-char hex
+_GITHUB_TOKEN_RE = re.compile(
+    r"(?:gh[opusr]_[A-Za-z0-9_]{20,251}|github_pat_[A-Za-z0-9_]{20,244}|[0-9a-f]{40})"
+)
+
+OAUTH_NOT_CONFIGURED = (
+    "GitHub OAuth not configured. "
+    "Set GITHUB_CLIENT_ID and GITHUB_CLIENT_SECRET environment variables."
+)
+
+
+def get_oauth_service(request: Request) -> GitHubOAuthService | None:
+    """Get the GitHubOAuthService built at startup (None if OAuth is not configured)"""
+    state = request.app.state
+    if not hasattr(state, "oauth_service"):
+        # Lifespan did not run (e.g. tests); build one on the fly
+        try:
+            return GitHubOAuthService(getattr(state, "gh_client", None))
+        except ValueError:
+            return None
+    return state.oauth_service
+
+
+OAuthService = Annotated[GitHubOAuthService | None, Depends(get_oauth_service)]
+
+
+def _oauth_not_configured() -> HTTPException:
+    """Build the 503 raised when GitHub OAuth credentials are missing"""
+    logger.error("OAuth not configured")
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=OAUTH_NOT_CONFIGURED,
+    )
+
 
 class AuthorizeResponse(BaseModel):
     """Response containing OAuth authorization URL"""
 
+    model_config = {"frozen": True}
+
     authorize_url: str
     state: str
 
@@ -31,6 +77,8 @@ class AuthorizeResponse(BaseModel):
 class TokenResponse(BaseModel):
     """Response containing OAuth tokens"""
 
+    model_config = {"frozen": True}
+
     access_token: str
     token_type: str
     scope: str
@@ -39,6 +87,8 @@ class TokenResponse(BaseModel):
 class GitHubUserResponse(BaseModel):
     """GitHub user information"""
 
+    model_config = {"frozen": True}
+
     id: int
     login: str
     name: str | None
@@ -56,7 +106,7 @@ class CallbackRequest(BaseModel):
 class CallbackResponse(BaseModel):
     """OAuth callback response - matches frontend expectations"""
 
-    model_config = {"populate_by_name": True}
+    model_config = {"populate_by_name": True, "frozen": True}
 
     username: str
     is_logged_in: bool = Field(serialization_alias="isLoggedIn")
@@ -64,6 +114,7 @@ class CallbackResponse(BaseModel):
 
 @router.get("/github/authorize", response_model=AuthorizeResponse)
 async def github_authorize(
+    oauth_service: OAuthService,
     scope: str = Query(
         default="repo,user",
         description="OAuth scopes (comma-separated)",
@@ -82,6 +133,7 @@ async def github_authorize(
     - `read:org`: Read org membership (optional)
 
     Args:
+        oauth_service: Shared GitHub OAuth service
         scope: Comma-separated OAuth scopes
 
     Returns:
@@ -90,29 +142,54 @@ async def github_authorize(
     Raises:
         503: If GitHub OAuth is not configured
     """
-    try:
-        oauth_service = GitHubOAuthService()
-        state = oauth_service.generate_state()
-        authorize_url = oauth_service.get_authorize_url(state, scope)
+    if oauth_service is None:
+        raise _oauth_not_configured()
 
-        logger.info("Generated OAuth authorize URL", extra={"scope": scope})
+    state = oauth_service.generate_state()
+    authorize_url = oauth_service.get_authorize_url(state, scope)
 
-        return AuthorizeResponse(
-            authorize_url=authorize_url,
-            state=state,
-        )
+    logger.info("Generated OAuth authorize URL", extra={"scope": scope})
 
-    except ValueError as e:
-        logger.error("OAuth not configured", extra={"error": str(e)})
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail=str(e),
-        )
+    # Built from trusted internal values; skip the validation pass
+    return AuthorizeResponse.model_construct(
+        authorize_url=authorize_url,
+        state=state,
+    )
+
+
+async def _verify_jwt(
+    supabase: AsyncClient, credentials: HTTPAuthorizationCredentials | None
+) -> UUID | None:
+    """
+    Resolve the logged-in user's ID from the optional JWT.
+
+    Never raises: a missing or invalid JWT just means the callback runs in the
+    onboarding (not logged in) flow.
+    """
+    if not credentials:
+        logger.info("[OAuth] No JWT provided - user not logged in (onboarding flow)")
+        return None
+
+    try:
+        user_response = await supabase.auth.get_user(credentials.credentials)
+    except Exception as e:
+        logger.error("[OAuth] Failed to verify JWT: %s", e, exc_info=True)
+        return None
+
+    if not user_response.user:
+        logger.warning("[OAuth] JWT provided but user not found in Supabase")
+        return None
+
+    user_id = parse_uuid(user_response.user.id)
+    logger.info("[OAuth] User authenticated: user_id=%s", user_id)
+    return user_id
 
 
 @router.post("/github/callback", response_model=CallbackResponse)
 async def github_callback(
     request: CallbackRequest,
+    supabase: SupabaseClient,
+    oauth_service: OAuthService,
     credentials: Annotated[
         HTTPAuthorizationCredentials | None, Depends(security)
     ] = None,
@@ -131,6 +208,8 @@ async def github_callback(
 
     Args:
         request: Callback data containing code and state
+        supabase: Supabase client
+        oauth_service: Shared GitHub OAuth service
         credentials: Optional JWT token (if user is already logged in)
 
     Returns:
@@ -143,11 +222,13 @@ async def github_callback(
     code_preview = request.code[:8] if len(request.code) > 8 else request.code
     state_preview = request.state[:8] if len(request.state) > 8 else request.state
     logger.info(
-        f"[OAuth] Starting callback: code={code_preview}..., state={state_preview}..."
+        "[OAuth] Starting callback: code=%s..., state=%s...",
+        code_preview,
+        state_preview,
     )
 
-    oauth_service = GitHubOAuthService()
-    supabase = get_supabase_client()
+    if oauth_service is None:
+        raise _oauth_not_configured()
 
     # Step 1: Exchange code for token
     try:
@@ -155,95 +236,78 @@ async def github_callback(
         token_data = await oauth_service.exchange_code(request.code)
         access_token = token_data["access_token"]
         scope = token_data.get("scope", "")
-        logger.info(f"[OAuth] Token exchanged successfully, scope={scope}")
-    except ValueError as e:
-        logger.error(f"[OAuth] OAuth not configured: {e}")
-        logger.error(f"[OAuth] Traceback: {traceback.format_exc()}")
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail=str(e),
-        )
+        logger.info("[OAuth] Token exchanged successfully, scope=%s", scope)
     except GitHubOAuthError as e:
-        logger.error(f"[OAuth] Code exchange failed: {e}")
-        logger.error(f"[OAuth] Traceback: {traceback.format_exc()}")
+        logger.error("[OAuth] Code exchange failed: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e),
         )
 
-    # Step 2: Get GitHub user info
+    # Step 2: Get GitHub user info, verifying the JWT (if any) concurrently
     try:
         logger.info("[OAuth] Step 2: Getting GitHub user info...")
-        user_data = await oauth_service.get_user_info(access_token)
+        user_data, user_id = await asyncio.gather(
+            oauth_service.get_user_info(access_token),
+            _verify_jwt(supabase, credentials),
+        )
         github_username = user_data["login"]
-        logger.info(f"[OAuth] GitHub user: {github_username}")
+        logger.info("[OAuth] GitHub user: %s", github_username)
     except GitHubOAuthError as e:
-        logger.error(f"[OAuth] Failed to get GitHub user info: {e}")
-        logger.error(f"[OAuth] Traceback: {traceback.format_exc()}")
+        logger.error("[OAuth] Failed to get GitHub user info: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Failed to get GitHub user info: {e}",
         )
 
-    # Step 3: Check if user is logged in and save token
-    is_logged_in = False
-    user_id = None
+    # Step 3: If user is logged in, save token
+    is_logged_in = user_id is not None
 
-    if credentials:
+    if is_logged_in:
         try:
-            logger.info("[OAuth] Step 3: Verifying JWT and saving token...")
-            token = credentials.credentials
-            user_response = supabase.auth.get_user(token)
-
-            if user_response.user:
-                user_id = str(user_response.user.id)
-                is_logged_in = True
-                logger.info(f"[OAuth] User authenticated: user_id={user_id}")
-
-                # Save token to user preferences
-                dao = UserPreferenceDAO(supabase)
-                preference = dao.update_github(
-                    user_id=UUID(user_id),
+            logger.info("[OAuth] Step 3: Saving token...")
+
+            # Save token to user preferences
+            dao = UserPreferenceDAO(supabase)
+            preference = await dao.update_github(
+                user_id=user_id,
+                github_token=access_token,
+                github_username=github_username,
+            )
+
+            if preference:
+                logger.info("[OAuth] Token saved to preferences for user %s", user_id)
+            else:
+                # User might not have preferences yet, create them
+                logger.info(
+                    "[OAuth] No existing preferences, creating new for user %s",
+                    user_id,
+                )
+                await dao.create_or_update(
+                    user_id=user_id,
+                    languages=[],
+                    skills=[],
+                    project_interests=[],
+                    issue_interests=[],
                     github_token=access_token,
                     github_username=github_username,
                 )
-
-                if preference:
-                    logger.info(
-                        f"[OAuth] Token saved to preferences for user {user_id}"
-                    )
-                else:
-                    # User might not have preferences yet, create them
-                    logger.info(
-                        f"[OAuth] No existing preferences, creating new for user {user_id}"
-                    )
-                    dao.create_or_update(
-                        user_id=UUID(user_id),
-                        languages=[],
-                        skills=[],
-                        project_interests=[],
-                        issue_interests=[],
-                        github_token=access_token,
-                        github_username=github_username,
-                    )
-                    logger.info(
-                        f"[OAuth] Created preferences with GitHub token for user {user_id}"
-                    )
-            else:
-                logger.warning("[OAuth] JWT provided but user not found in Supabase")
+                logger.info(
+                    "[OAuth] Created preferences with GitHub token for user %s",
+                    user_id,
+                )
         except Exception as e:
             # Don't fail the whole callback if saving fails
-            logger.error(f"[OAuth] Failed to verify JWT or save token: {e}")
-            logger.error(f"[OAuth] Traceback: {traceback.format_exc()}")
+            logger.error("[OAuth] Failed to save token: %s", e, exc_info=True)
             # Still continue - user can try again from dashboard
-    else:
-        logger.info("[OAuth] No JWT provided - user not logged in (onboarding flow)")
 
     logger.info(
-        f"[OAuth] Callback complete: username={github_username}, isLoggedIn={is_logged_in}"
+        "[OAuth] Callback complete: username=%s, isLoggedIn=%s",
+        github_username,
+        is_logged_in,
     )
 
-    return CallbackResponse(
+    return CallbackResponse.model_construct(
         username=github_username,
         is_logged_in=is_logged_in,
     )
@@ -251,6 +315,7 @@ async def github_callback(
 
 @router.get("/github/user", response_model=GitHubUserResponse)
 async def get_github_user(
+    oauth_service: OAuthService,
     access_token: str = Query(..., description="GitHub access token"),
 ) -> GitHubUserResponse:
     """
@@ -259,6 +324,7 @@ async def get_github_user(
     This endpoint fetches the authenticated user's GitHub profile information.
 
     Args:
+        oauth_service: Shared GitHub OAuth service
         access_token: GitHub OAuth access token
 
     Returns:
@@ -268,11 +334,13 @@ async def get_github_user(
         401: If token is invalid or expired
         503: If GitHub OAuth is not configured
     """
+    if oauth_service is None:
+        raise _oauth_not_configured()
+
     try:
-        oauth_service = GitHubOAuthService()
         user_data = await oauth_service.get_user_info(access_token)
 
-        return GitHubUserResponse(
+        return GitHubUserResponse.model_construct(
             id=user_data["id"],
             login=user_data["login"],
             name=user_data.get("name"),
@@ -280,13 +348,6 @@ async def get_github_user(
             avatar_url=user_data.get("avatar_url"),
         )
 
-    except ValueError as e:
-        logger.error("OAuth not configured", extra={"error": str(e)})
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail=str(e),
-        )
-
     except GitHubOAuthError as e:
         logger.error("Failed to get GitHub user", extra={"error": str(e)})
         raise HTTPException(
@@ -297,27 +358,38 @@ async def get_github_user(
 
 @router.get("/github/validate")
 async def validate_github_token(
+    oauth_service: OAuthService,
     access_token: str = Query(..., description="GitHub access token"),
 ) -> dict:
     """
     Validate a GitHub access token.
 
     Args:
+        oauth_service: Shared GitHub OAuth service
         access_token: GitHub OAuth access token
 
     Returns:
         Validation status
     """
-    try:
-        oauth_service = GitHubOAuthService()
-        is_valid = await oauth_service.validate_token(access_token)
-
-        return {
-            "valid": is_valid,
-        }
-
-    except ValueError:
+    if oauth_service is None:
         return {
             "valid": False,
             "error": "OAuth not configured",
         }
+
+    if not _GITHUB_TOKEN_RE.fullmatch(access_token):
+        return {"valid": False}
+
+    cache_key = hashlib.blake2b(access_token.encode(), digest_size=16).hexdigest()
+    is_valid = _validate_cache.get(cache_key)
+    if is_valid is None:
+        try:
+            is_valid = await oauth_service.validate_token(access_token)
+        except GitHubOAuthError as e:
+            logger.warning("Could not validate GitHub token: %s", e)
+            return {"valid": False}
+        _validate_cache[cache_key] = is_valid
+
+    return {
+        "valid": is_valid,
+    }
@@ -1,39 +1,34 @@
 """Issue Controller - /issues/* Routes"""
 
+import asyncio
 import logging
-from uuid import UUID
 
 from fastapi import APIRouter, HTTPException, status
+from pydantic import TypeAdapter
 
-from ..config import get_settings
-from ..dao.user_preference_dao import UserPreferenceDAO
 from ..dto.issue_dto import IssueDTO, IssueFilterDTO
-from ..services.github_service import GitHubService
 from ..services.issue_service import IssueService
-from ..services.openrouter_service import OpenRouterService
-from ..services.prompt_service import PromptService
-from ..utils.dependencies import CurrentUser, SupabaseClient
+from ..utils.dependencies import (
+    AuthedContextDep,
+    GitHubServiceDep,
+    OpenRouterServiceDep,
+    PromptServiceDep,
+)
+from ..utils.streaming import json_list_response
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/issues", tags=["Issues"])
 
-
-def _get_openrouter_service() -> OpenRouterService | None:
-    """Get OpenRouter service if API key is configured"""
-    settings = get_settings()
-    if settings.openrouter_api_key:
-        try:
-            return OpenRouterService()
-        except ValueError as e:
-            logger.warning(f"Failed to initialize OpenRouter service: {e}")
-    return None
+_issue_list_adapter = TypeAdapter(list[IssueDTO])
 
 
 @router.post("/search", response_model=list[IssueDTO])
 async def search_issues(
     filter_data: IssueFilterDTO,
-    current_user: CurrentUser,  # Require authentication
-    supabase: SupabaseClient,
+    ctx: AuthedContextDep,  # Require authentication
+    github_service: GitHubServiceDep,
+    openrouter_service: OpenRouterServiceDep,
+    prompt_service: PromptServiceDep,
 ) -> list[IssueDTO]:
     """
     Search and filter issues from a GitHub repository.
@@ -46,33 +41,31 @@ async def search_issues(
     - **limit**: Maximum number of issues to return (default: 20)
     """
     try:
-        # Get user preferences for AI ranking
-        user_id = UUID(str(current_user["id"]))
-        user_preference_dao = UserPreferenceDAO(supabase)
-        user_preference = user_preference_dao.get_by_user_id(user_id)
-
-        # Initialize services
-        github_service = GitHubService()
-        openrouter_service = _get_openrouter_service()
-        prompt_service = PromptService()
-
         issue_service = IssueService(
             github_service=github_service,
             openrouter_service=openrouter_service,
             prompt_service=prompt_service,
         )
 
-        return await issue_service.search_issues(
-            filter_data,
-            user_preference=user_preference,
-        )
+        # Preferences only matter for AI ranking; fetch them while GitHub is queried
+        if openrouter_service is None:
+            issues = await issue_service.filter_issues(filter_data)
+            user_preference = None
+        else:
+            issues, user_preference = await asyncio.gather(
+                issue_service.filter_issues(filter_data),
+                ctx.get_preference(allow_cached=True),
+            )
+
+        ranked = await issue_service.rank_issues(filter_data, issues, user_preference)
+        return json_list_response(_issue_list_adapter, ranked)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e),
         )
     except Exception as e:
-        logger.error(f"Failed to fetch issues: {e}", exc_info=True)
+        logger.error("Failed to fetch issues: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
             detail=f"Failed to fetch issues from GitHub: {str(e)}",
@@ -1,60 +1,52 @@
 """Repository Controller - /repos/* Routes"""
 
 import logging
-from uuid import UUID
 
 from fastapi import APIRouter, HTTPException, Query, status
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 
-from ..config import get_settings
-from ..dao.user_preference_dao import UserPreferenceDAO
 from ..dto.repo_dto import RepoDTO, RepoRecommendQueryDTO
-from ..services.github_service import GitHubService
-from ..services.openrouter_service import OpenRouterService
-from ..services.prompt_service import PromptService
 from ..services.repo_service import RepoService
-from ..utils.dependencies import CurrentUser, DBSession
+from ..utils.dependencies import (
+    AuthedContextDep,
+    CurrentUser,
+    GitHubServiceDep,
+    OpenRouterServiceDep,
+    PromptServiceDep,
+)
+from ..utils.streaming import json_list_response, json_model_response
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/repos", tags=["Repositories"])
 
+_repo_list_adapter = TypeAdapter(list[RepoDTO])
+
 
 class ForkStatusResponse(BaseModel):
     """Response model for fork status check"""
 
+    model_config = {"frozen": True}
+
     has_fork: bool
     fork_url: str | None = None
     fork_full_name: str | None = None
 
 
-class ForkCreateRequest(BaseModel):
-    """Request model for creating a fork"""
-
-    repo_url: str
-
-
 class ForkCreateResponse(BaseModel):
     """Response model for fork creation"""
 
+    model_config = {"frozen": True}
+
     fork_url: str
     fork_full_name: str
 
 
-def _get_openrouter_service() -> OpenRouterService | None:
-    """Get OpenRouter service if API key is configured"""
-    settings = get_settings()
-    if settings.openrouter_api_key:
-        try:
-            return OpenRouterService()
-        except ValueError as e:
-            logger.warning(f"Failed to initialize OpenRouter service: {e}")
-    return None
-
-
 @router.get("/recommend", response_model=list[RepoDTO])
 async def recommend_repos(
-    current_user: CurrentUser,
-    db: DBSession,
+    ctx: AuthedContextDep,
+    github_service: GitHubServiceDep,
+    openrouter_service: OpenRouterServiceDep,
+    prompt_service: PromptServiceDep,
     limit: int = Query(
         default=10, ge=1, le=50, description="Number of repos to return"
     ),
@@ -76,31 +68,25 @@ async def recommend_repos(
     - **min_stars**: Minimum star count (default: 100)
     - **max_stars**: Maximum star count (optional, for finding smaller projects)
     """
-    from uuid import UUID
-
     try:
-        user_id = UUID(str(current_user["id"]))
         query = RepoRecommendQueryDTO(
             limit=limit,
             min_stars=min_stars,
             max_stars=max_stars,
         )
 
-        # Initialize services
-        github_service = GitHubService()
-        openrouter_service = _get_openrouter_service()
-        prompt_service = PromptService()
-
         repo_service = RepoService(
             github_service=github_service,
-            supabase=db,
             openrouter_service=openrouter_service,
             prompt_service=prompt_service,
         )
 
-        return await repo_service.recommend_repos(user_id, query)
+        # Ranking only reads languages/skills, so a briefly cached row is fine
+        user_preference = await ctx.get_preference(allow_cached=True)
+        repos = await repo_service.recommend_repos(user_preference, query)
+        return json_list_response(_repo_list_adapter, repos)
     except Exception as e:
-        logger.error(f"Failed to fetch recommendations: {e}")
+        logger.error("Failed to fetch recommendations: %s", e)
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
             detail=f"Failed to fetch recommendations: {str(e)}",
@@ -112,12 +98,12 @@ async def get_repo_info(
     owner: str,
     repo: str,
     current_user: CurrentUser,
+    github_service: GitHubServiceDep,
 ) -> RepoDTO:
     """Get information about a specific repository"""
     try:
-        github_service = GitHubService()
         repo_url = f"https://github.com/{owner}/{repo}"
-        return await github_service.get_repo_info(repo_url)
+        return json_model_response(await github_service.get_repo_info(repo_url))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -129,8 +115,8 @@ async def get_repo_info(
 async def check_fork_status(
     owner: str,
     repo: str,
-    current_user: CurrentUser,
-    db: DBSession,
+    ctx: AuthedContextDep,
+    github_service: GitHubServiceDep,
 ) -> ForkStatusResponse:
     """
     Check if the current user has forked a repository.
@@ -138,46 +124,49 @@ async def check_fork_status(
     Requires the user to have connected their GitHub account.
     """
     try:
-        user_id = UUID(str(current_user["id"]))
+        user_id = ctx.user_id
         logger.info(
-            f"[Fork] Checking fork status for user {user_id}, repo {owner}/{repo}"
+            "[Fork] Checking fork status for user %s, repo %s/%s", user_id, owner, repo
         )
 
         # Get user's GitHub token from preferences
-        user_pref_dao = UserPreferenceDAO(db)
-        user_pref = user_pref_dao.get_by_user_id(user_id)
+        user_pref = await ctx.get_preference()
 
         if not user_pref:
-            logger.warning(f"[Fork] No user preferences found for user {user_id}")
+            logger.warning("[Fork] No user preferences found for user %s", user_id)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="User preferences not found. Please complete onboarding first.",
             )
 
-        logger.info(
-            f"[Fork] User pref found - github_username: {user_pref.github_username}, has_token: {bool(user_pref.github_token)}"
+        logger.debug(
+            "[Fork] User pref found - github_username: %s, has_token: %s",
+            user_pref.github_username,
+            user_pref.github_token is not None,
         )
 
         if not user_pref.github_token:
             logger.warning(
-                f"[Fork] No GitHub token for user {user_id}, github_username: {user_pref.github_username}"
+                "[Fork] No GitHub token for user %s, github_username: %s",
+                user_id,
+                user_pref.github_username,
             )
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="GitHub account not connected. Please connect your GitHub account first.",
             )
 
-        github_service = GitHubService()
         repo_url = f"https://github.com/{owner}/{repo}"
 
         result = await github_service.check_user_fork(repo_url, user_pref.github_token)
-        logger.info(f"[Fork] Fork check result: {result}")
-        return ForkStatusResponse(**result)
+        logger.debug("[Fork] Fork check result: %s", result)
+        # Built by GitHubService from GitHub's response; skip the validation pass
+        return ForkStatusResponse.model_construct(**result)
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"[Fork] Failed to check fork status: {e}", exc_info=True)
+        logger.error("[Fork] Failed to check fork status: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to check fork status: {str(e)}",
@@ -188,8 +177,8 @@ async def check_fork_status(
 async def create_fork(
     owner: str,
     repo: str,
-    current_user: CurrentUser,
-    db: DBSession,
+    ctx: AuthedContextDep,
+    github_service: GitHubServiceDep,
 ) -> ForkCreateResponse:
     """
     Create a fork of a repository for the current user.
@@ -197,11 +186,8 @@ async def create_fork(
     Requires the user to have connected their GitHub account.
     """
     try:
-        user_id = UUID(str(current_user["id"]))
-
         # Get user's GitHub token from preferences
-        user_pref_dao = UserPreferenceDAO(db)
-        user_pref = user_pref_dao.get_by_user_id(user_id)
+        user_pref = await ctx.get_preference()
 
         if not user_pref or not user_pref.github_token:
             raise HTTPException(
@@ -209,16 +195,15 @@ async def create_fork(
                 detail="GitHub account not connected. Please connect your GitHub account first.",
             )
 
-        github_service = GitHubService()
         repo_url = f"https://github.com/{owner}/{repo}"
 
         result = await github_service.create_fork(repo_url, user_pref.github_token)
-        return ForkCreateResponse(**result)
+        return ForkCreateResponse.model_construct(**result)
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to create fork: {e}")
+        logger.error("Failed to create fork: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create fork: {str(e)}",
@@ -1,19 +1,23 @@
 """Agent Session Data Access Object - Supabase persistence for agent sessions"""
 
 import logging
-import traceback
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
-from supabase import Client
+from supabase import AsyncClient
+
+from .base import SUPABASE_ERRORS, execute_with_retry
 
 logger = logging.getLogger("agent.dao")
 
+# Page size for session lists
+DEFAULT_SESSION_LIMIT = 50
+
 
-@dataclass
+@dataclass(slots=True, frozen=True, kw_only=True)
 class AgentSessionRecord:
-    """Represents an agent session from the database"""
+    """Represents an agent session from the database (immutable snapshot of a row)"""
 
     id: str
     user_id: str
@@ -35,11 +39,14 @@ class AgentSessionRecord:
 class AgentSessionDAO:
     """DAO for agent sessions using Supabase"""
 
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: AsyncClient):
         self.supabase = supabase
         self.table = "agent_sessions"
+        # Each verb (select/insert/...) builds a fresh query from this, so one
+        # table builder serves every call made through this DAO instance
+        self._table = supabase.table(self.table)
 
-    def create(
+    async def create(
         self,
         user_id: str,
         repo_url: str,
@@ -61,47 +68,75 @@ class AgentSessionDAO:
             The session ID
         """
         logger.info(
-            f"Creating session: user_id={user_id}, repo_url={repo_url}, "
-            f"issue_number={issue_number}, issue_title={issue_title[:50]}..."
+            "Creating session: user_id=%s, repo_url=%s, issue_number=%s, "
+            "issue_title=%.50s...",
+            user_id,
+            repo_url,
+            issue_number,
+            issue_title,
         )
-        logger.debug(
-            f"Solution data keys: {list(solution.keys()) if solution else 'None'}"
+        logger.debug("Solution data keys: %s", list(solution) if solution else None)
+
+        session_ids = await self.create_many(
+            [
+                {
+                    "user_id": user_id,
+                    "repo_url": repo_url,
+                    "issue_number": issue_number,
+                    "issue_title": issue_title,
+                    "solution": solution,
+                }
+            ]
         )
+        return session_ids[0]
+
+    async def create_many(self, sessions: list[dict[str, Any]]) -> list[str]:
+        """
+        Create several agent sessions with a single INSERT.
+
+        Args:
+            sessions: Dicts with user_id, repo_url, issue_number, issue_title
+                and solution (the same fields create() takes)
 
+        Returns:
+            The new session IDs, in input order
+        """
+        if not sessions:
+            return []
+
+        # Every row shares one set of timestamps, formatted once
         now = datetime.now(UTC)
-        expires_at = now + timedelta(hours=1)
-
-        data = {
-            "user_id": user_id,
-            "repo_url": repo_url,
-            "issue_number": issue_number,
-            "issue_title": issue_title,
-            "solution": solution,
-            "created_at": now.isoformat(),
-            "last_accessed_at": now.isoformat(),
-            "expires_at": expires_at.isoformat(),
+        now_iso = now.isoformat()
+        defaults = {
+            "created_at": now_iso,
+            "last_accessed_at": now_iso,
+            "expires_at": (now + timedelta(hours=1)).isoformat(),
             "status": "pending",
         }
+        data = [{**session, **defaults} for session in sessions]
 
-        logger.debug(f"Inserting data into {self.table}")
+        logger.debug("Inserting %d row(s) into %s", len(data), self.table)
 
         try:
-            response = self.supabase.table(self.table).insert(data).execute()
-            logger.debug(f"Supabase response: data={response.data is not None}")
+            response = await execute_with_retry(
+                self._table.insert(data), idempotent=False
+            )
+            logger.debug("Supabase response: data=%s", response.data is not None)
 
             if response.data:
-                session_id = response.data[0]["id"]
-                logger.info(f"Session created successfully: {session_id}")
-                return session_id
+                session_ids = [row["id"] for row in response.data]
+                logger.info("Session(s) created successfully: %s", session_ids)
+                return session_ids
 
             logger.error("No data returned from Supabase insert")
             raise Exception("Failed to create session - no data returned")
         except Exception as e:
-            logger.error(f"Failed to create session: {type(e).__name__}: {e}")
-            logger.error(f"Traceback: {traceback.format_exc()}")
+            logger.error(
+                "Failed to create session: %s: %s", type(e).__name__, e, exc_info=True
+            )
             raise
 
-    def get(self, session_id: str) -> AgentSessionRecord | None:
+    async def get(self, session_id: str) -> AgentSessionRecord | None:
         """
         Get a session by ID.
 
@@ -112,79 +147,102 @@ class AgentSessionDAO:
             The session record if found, None otherwise
         """
         try:
-            response = (
-                self.supabase.table(self.table)
-                .select("*")
-                .eq("id", session_id)
-                .maybe_single()
-                .execute()
+            response = await execute_with_retry(
+                self._table.select("*").eq("id", session_id).maybe_single()
             )
 
-            if not response.data:
+            # maybe_single() yields no response at all when the row is missing
+            if response is None or not response.data:
                 return None
 
             return self._dict_to_record(response.data)
-        except Exception:
+        except SUPABASE_ERRORS as e:
+            logger.warning("get failed: %s", e)
             return None
 
-    def get_by_user(self, user_id: str) -> list[AgentSessionRecord]:
+    async def acquire(
+        self,
+        session_id: str,
+        user_id: str,
+        new_status: str | None = None,
+    ) -> AgentSessionRecord | None:
         """
-        Get all sessions for a user.
+        Authorize and touch a session in a single round-trip.
+
+        Resets the TTL (and optionally the status) of the session only if it
+        belongs to the user and has not expired, via the
+        acquire_agent_session() database function.
 
         Args:
-            user_id: The user ID
+            session_id: The session ID
+            user_id: The user who must own the session
+            new_status: Optional status to set (None keeps the current one)
 
         Returns:
-            List of session records
+            The updated session record, or None if the session is missing,
+            owned by another user, or expired
         """
         try:
-            response = (
-                self.supabase.table(self.table)
-                .select("*")
-                .eq("user_id", user_id)
-                .order("created_at", desc=True)
-                .execute()
+            response = await execute_with_retry(
+                self.supabase.rpc(
+                    "acquire_agent_session",
+                    {
+                        "p_session_id": session_id,
+                        "p_user_id": user_id,
+                        "p_status": new_status,
+                    },
+                )
             )
 
             if not response.data:
-                return []
+                return None
 
-            return [self._dict_to_record(d) for d in response.data]
-        except Exception:
-            return []
+            return self._dict_to_record(response.data[0])
+        except SUPABASE_ERRORS as e:
+            logger.warning("acquire failed: %s", e)
+            return None
 
-    def update_last_accessed(self, session_id: str) -> bool:
+    async def list_summaries(
+        self, user_id: str, limit: int = DEFAULT_SESSION_LIMIT, offset: int = 0
+    ) -> list[dict[str, Any]]:
         """
-        Update last_accessed_at to reset the TTL.
-        The database trigger will automatically update expires_at.
+        Get a page of lightweight session summaries for a user.
+
+        Selects only the columns needed for listing (aliased to the
+        SessionResponse field names) and extracts the solution summary
+        server-side instead of fetching the full solution JSON.
 
         Args:
-            session_id: The session ID
+            user_id: The user ID
+            limit: Maximum number of sessions to return
+            offset: Number of sessions to skip
 
         Returns:
-            True if updated, False otherwise
+            List of summary dicts, newest first
         """
         try:
-            now = datetime.now(UTC)
-            expires_at = now + timedelta(hours=1)
-
-            response = (
-                self.supabase.table(self.table)
-                .update(
-                    {
-                        "last_accessed_at": now.isoformat(),
-                        "expires_at": expires_at.isoformat(),
-                    }
+            response = await execute_with_retry(
+                self._table.select(
+                    "session_id:id,repo_url,issue_number,issue_title,"
+                    "created_at,expires_at,status,"
+                    "solution_summary:solution->>summary"
                 )
-                .eq("id", session_id)
-                .execute()
+                .eq("user_id", user_id)
+                .order("created_at", desc=True)
+                .range(offset, offset + limit - 1)
             )
 
-            return bool(response.data)
-        except Exception:
-            return False
+            if not response.data:
+                return []
+
+            for row in response.data:
+                row["solution_summary"] = row.get("solution_summary") or ""
+            return response.data
+        except SUPABASE_ERRORS as e:
+            logger.warning("list_summaries failed: %s", e)
+            return []
 
-    def set_status(self, session_id: str, status: str) -> bool:
+    async def set_status(self, session_id: str, status: str) -> bool:
         """
         Update the session status.
 
@@ -196,37 +254,38 @@ class AgentSessionDAO:
             True if updated, False otherwise
         """
         try:
-            response = (
-                self.supabase.table(self.table)
-                .update({"status": status})
-                .eq("id", session_id)
-                .execute()
+            response = await execute_with_retry(
+                self._table.update({"status": status}).eq("id", session_id)
             )
 
             return bool(response.data)
-        except Exception:
+        except SUPABASE_ERRORS as e:
+            logger.warning("set_status failed: %s", e)
             return False
 
-    def delete(self, session_id: str) -> bool:
+    async def delete(self, session_id: str, user_id: str | None = None) -> bool:
         """
         Delete a session.
 
         Args:
             session_id: The session ID
+            user_id: If given, only delete the session when it belongs to this user
 
         Returns:
             True if deleted, False otherwise
         """
         try:
-            response = (
-                self.supabase.table(self.table).delete().eq("id", session_id).execute()
-            )
+            query = self._table.delete().eq("id", session_id)
+            if user_id is not None:
+                query = query.eq("user_id", user_id)
+            response = await execute_with_retry(query)
 
             return bool(response.data)
-        except Exception:
+        except SUPABASE_ERRORS as e:
+            logger.warning("delete failed: %s", e)
             return False
 
-    def cleanup_expired(self) -> int:
+    async def cleanup_expired(self) -> int:
         """
         Delete all expired sessions.
 
@@ -234,20 +293,16 @@ class AgentSessionDAO:
             Number of sessions deleted
         """
         try:
-            now = datetime.now(UTC)
-
-            response = (
-                self.supabase.table(self.table)
-                .delete()
-                .lt("expires_at", now.isoformat())
-                .execute()
+            response = await execute_with_retry(
+                self.supabase.rpc("cleanup_expired_agent_sessions")
             )
 
-            return len(response.data) if response.data else 0
-        except Exception:
+            return response.data or 0
+        except SUPABASE_ERRORS as e:
+            logger.warning("cleanup_expired failed: %s", e)
             return 0
 
-    def count_by_user(self, user_id: str) -> int:
+    async def count_by_user(self, user_id: str) -> int:
         """
         Count active sessions for a user.
 
@@ -257,17 +312,17 @@ class AgentSessionDAO:
         Returns:
             Number of active sessions
         """
+        # Count server-side; head=True ships no rows
         try:
-            response = (
-                self.supabase.table(self.table)
-                .select("id", count="exact")
+            response = await execute_with_retry(
+                self._table.select("id", count="exact", head=True)
                 .eq("user_id", user_id)
                 .gt("expires_at", datetime.now(UTC).isoformat())
-                .execute()
             )
 
             return response.count or 0
-        except Exception:
+        except SUPABASE_ERRORS as e:
+            logger.warning("count_by_user failed: %s", e)
             return 0
 
     def _dict_to_record(self, data: dict) -> AgentSessionRecord:
@@ -289,7 +344,5 @@ class AgentSessionDAO:
         """Parse datetime from string or return as-is"""
         if isinstance(value, datetime):
             return value
-        # Handle ISO format with Z suffix
-        if value.endswith("Z"):
-            value = value[:-1] + "+00:00"
+        # C-implemented on Python 3.11+, including the "Z" suffix
         return datetime.fromisoformat(value)
@@ -1,14 +1,100 @@
 """Base Data Access Object"""
 
-from typing import Generic, TypeVar
+import asyncio
+import logging
+import random
+from collections.abc import Sequence
+from typing import Any, Generic, Protocol, TypeVar
 from uuid import UUID
 
-from sqlalchemy.orm import Session
+import httpx
+from sqlalchemy import delete, update
+from sqlalchemy.orm import InstrumentedAttribute, Query, Session, selectinload
+from supabase import PostgrestAPIError
 
 from ..models.user_preference import Base
 
 ModelType = TypeVar("ModelType", bound=Base)
 
+# What a Supabase (PostgREST) call raises when the request itself fails:
+# an error response from PostgREST, or a transport error from httpx
+SUPABASE_ERRORS = (PostgrestAPIError, httpx.HTTPError)
+
+logger = logging.getLogger(__name__)
+
+# Attempts per call, and the full-jitter exponential backoff bounds (seconds)
+RETRY_ATTEMPTS = 4
+RETRY_INITIAL_DELAY = 0.1
+RETRY_MAX_DELAY = 2.0
+
+# Failures where PostgREST never processed the request: throttling, an
+# unavailable gateway, or PostgREST unable to reach/pool a DB connection
+_NOT_PROCESSED_CODES = frozenset(
+    {"429", "503", "PGRST000", "PGRST001", "PGRST002", "PGRST003"}
+)
+# Gateway errors where the request may or may not have been applied
+_AMBIGUOUS_CODES = frozenset({"500", "502", "504", "520"})
+# Transport errors raised before the request was sent
+_NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class _Executable(Protocol):
+    def retry(self, enabled: bool) -> Any: ...
+
+    async def execute(self) -> Any: ...
+
+
+def _is_retryable(exc: Exception, idempotent: bool) -> bool:
+    """Decide whether a failed Supabase call is safe and worth retrying"""
+    if isinstance(exc, PostgrestAPIError):
+        code = str(exc.code)
+        return code in _NOT_PROCESSED_CODES or (idempotent and code in _AMBIGUOUS_CODES)
+    if isinstance(exc, httpx.TransportError):
+        return idempotent or isinstance(exc, _NOT_SENT_ERRORS)
+    return False
+
+
+async def execute_with_retry(query: _Executable, *, idempotent: bool = True) -> Any:
+    """
+    Execute a PostgREST query, retrying transient failures with backoff.
+
+    Throttling (429), unavailable gateways and lost database connections are
+    retried up to RETRY_ATTEMPTS times with full-jitter exponential backoff.
+    Failures that may already have been applied (timeouts mid-request, 502/504)
+    are only retried for idempotent queries, so pass idempotent=False for
+    plain inserts. The client library's own GET/HEAD retry is disabled, so a
+    failing call makes at most RETRY_ATTEMPTS requests.
+
+    Args:
+        query: A built query or RPC call (anything with an async execute())
+        idempotent: Whether repeating the query is harmless
+
+    Returns:
+        The query's response
+
+    Raises:
+        PostgrestAPIError | httpx.HTTPError: The last error, once retries are
+            exhausted or the error is not retryable
+    """
+    # postgrest-py retries GET/HEAD 503/520 on its own with a fixed backoff;
+    # turn that off so this loop is the only retry layer
+    query.retry(False)
+    delay = RETRY_INITIAL_DELAY
+    for attempt in range(1, RETRY_ATTEMPTS + 1):
+        try:
+            return await query.execute()
+        except SUPABASE_ERRORS as e:
+            if attempt == RETRY_ATTEMPTS or not _is_retryable(e, idempotent):
+                raise
+            logger.info(
+                "Supabase call failed (attempt %d/%d), retrying: %s",
+                attempt,
+                RETRY_ATTEMPTS,
+                e,
+            )
+            await asyncio.sleep(random.uniform(0, delay))
+            delay = min(delay * 2, RETRY_MAX_DELAY)
+
 
 class BaseDAO(Generic[ModelType]):
     """Base DAO with common CRUD operations"""
@@ -17,13 +103,28 @@ class BaseDAO(Generic[ModelType]):
         self.model = model
         self.db = db
 
-    def get_by_id(self, id: UUID) -> ModelType | None:
-        """Get a record by ID"""
-        return self.db.query(self.model).filter(self.model.id == id).first()
+    def _query(self, eager: Sequence[InstrumentedAttribute] = ()) -> Query:
+        """Start a query on the model, eagerly loading the given relationships"""
+        query = self.db.query(self.model)
+        if eager:
+            # One extra SELECT ... IN per relationship instead of a lazy load per row
+            query = query.options(*(selectinload(rel) for rel in eager))
+        return query
+
+    def get_by_id(
+        self, id: UUID, eager: Sequence[InstrumentedAttribute] = ()
+    ) -> ModelType | None:
+        """Get a record by ID, optionally eager-loading relationships"""
+        return self._query(eager).filter(self.model.id == id).first()
 
-    def get_all(self, skip: int = 0, limit: int = 100) -> list[ModelType]:
-        """Get all records with pagination"""
-        return self.db.query(self.model).offset(skip).limit(limit).all()
+    def get_all(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        eager: Sequence[InstrumentedAttribute] = (),
+    ) -> list[ModelType]:
+        """Get all records with pagination, optionally eager-loading relationships"""
+        return self._query(eager).offset(skip).limit(limit).all()
 
     def create(self, obj_data: dict) -> ModelType:
         """Create a new record"""
@@ -34,19 +135,35 @@ class BaseDAO(Generic[ModelType]):
         return db_obj
 
     def update(self, db_obj: ModelType, update_data: dict) -> ModelType:
-        """Update an existing record"""
-        for field, value in update_data.items():
-            if value is not None:
-                setattr(db_obj, field, value)
+        """
+        Update an existing record, skipping None values.
+
+        Writes the values with a single UPDATE ... RETURNING instead of loading,
+        modifying and refreshing the object. The session expires objects on
+        commit, so the returned row is re-SELECTed on first attribute access,
+        not eagerly.
+
+        Raises:
+            sqlalchemy.exc.CompileError: If update_data has a key that is not a
+                column of the model (the old setattr loop silently accepted it)
+        """
+        values = {k: v for k, v in update_data.items() if v is not None}
+        if not values:
+            return db_obj
+        stmt = (
+            update(self.model)
+            .where(self.model.id == db_obj.id)
+            .values(**values)
+            .returning(self.model)
+            .execution_options(populate_existing=True)
+        )
+        row = self.db.execute(stmt).scalar_one()
         self.db.commit()
-        self.db.refresh(db_obj)
-        return db_obj
+        return row
 
     def delete(self, id: UUID) -> bool:
-        """Delete a record by ID"""
-        obj = self.get_by_id(id)
-        if obj:
-            self.db.delete(obj)
-            self.db.commit()
-            return True
-        return False
+        """Delete a record by ID (a single DELETE ... RETURNING, no pre-read)"""
+        stmt = delete(self.model).where(self.model.id == id).returning(self.model.id)
+        deleted = self.db.execute(stmt).first() is not None
+        self.db.commit()
+        return deleted
@@ -1,39 +1,139 @@
 """User Preference Data Access Object"""
 
-from datetime import datetime
+import logging
+from dataclasses import dataclass, replace
+from datetime import UTC, datetime
+from typing import Any
 from uuid import UUID
 
-from supabase import Client
+from cachetools import TTLCache
+from supabase import AsyncClient, PostgrestAPIError
 
+from ..config import get_settings
 from ..models.user_preference import UserPreference
+from .base import SUPABASE_ERRORS, execute_with_retry
+
+logger = logging.getLogger(__name__)
+
+# Postgres error code for unique_violation
+UNIQUE_VIOLATION = "23505"
+
+# Preferences are read by several routes per page load; keep found rows for a
+# short while per worker. Every write through this DAO evicts the user's entry,
+# but only in the worker that made it, so other workers can serve a stale row
+# until the TTL runs out. Only callers that opt in read from it, and cached rows
+# never carry the GitHub token.
+_cache_ttl = get_settings().user_preference_cache_ttl
+_preference_cache: TTLCache | None = (
+    TTLCache(maxsize=10_000, ttl=_cache_ttl) if _cache_ttl > 0 else None
+)
+
+
+def invalidate_cached_preference(user_id: UUID | str) -> None:
+    """Forget a user's cached preferences so the next read hits Supabase"""
+    if _preference_cache is not None:
+        _preference_cache.pop(str(user_id), None)
+
+
+def _as_uuid(value: Any) -> UUID | None:
+    """Coerce a Supabase id (string) to UUID, passing UUIDs and None through"""
+    return UUID(value) if isinstance(value, str) else value
+
+
+def _as_datetime(value: Any) -> datetime | None:
+    """Coerce a Supabase timestamp (ISO string) to datetime"""
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class PreferenceRecord:
+    """A user_preferences row; mimics the attributes of the UserPreference model"""
+
+    id: UUID | None
+    user_id: UUID | None
+    user_name: str | None
+    languages: list[str]
+    skills: list[dict]
+    project_interests: list[str]
+    issue_interests: list[str]
+    github_token: str | None
+    github_username: str | None
+    created_at: datetime | None
+    updated_at: datetime | None
 
 
 class UserPreferenceDAO:
     """DAO for UserPreference model using Supabase"""
 
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: AsyncClient):
         self.supabase = supabase
         self.table = "user_preferences"
+        # Each verb (select/insert/...) builds a fresh query from this, so one
+        # table builder serves every call made through this DAO instance
+        self._table = supabase.table(self.table)
+
+    async def get_by_user_id(
+        self, user_id: UUID | str, *, allow_cached: bool = False
+    ) -> UserPreference | None:
+        """
+        Get user preference by user_id (Supabase auth.users.id).
+
+        Accepts the id as a UUID or an already-trusted string; either way it is
+        only stringified for the query, never re-parsed.
+
+        Args:
+            user_id: The user's id
+            allow_cached: Accept a row from the short-lived per-worker cache.
+                Such a row may be a few seconds stale and always has
+                github_token set to None, so only pass this for reads that need
+                neither (e.g. ranking by languages and skills).
+        """
+        key = str(user_id)
+        if allow_cached and _preference_cache is not None:
+            cached = _preference_cache.get(key)
+            if cached is not None:
+                return cached
 
-    def get_by_user_id(self, user_id: UUID) -> UserPreference | None:
-        """Get user preference by user_id (Supabase auth.users.id)"""
         try:
-            response = (
-                self.supabase.table(self.table)
-                .select("*")
-                .eq("user_id", str(user_id))
-                .maybe_single()
-                .execute()
+            response = await execute_with_retry(
+                self._table.select("*").eq("user_id", str(user_id)).maybe_single()
             )
 
-            if not response.data:
+            # maybe_single() yields no response at all when the row is missing
+            if response is None or not response.data:
                 return None
 
-            return self._dict_to_model(response.data)
-        except Exception:
+            preference = self._dict_to_model(response.data)
+        except SUPABASE_ERRORS as e:
+            logger.warning("get_by_user_id failed: %s", e)
+            return None
+
+        if _preference_cache is not None:
+            _preference_cache[key] = replace(preference, github_token=None)
+        return preference
+
+    async def get_version(self, user_id: UUID | str) -> datetime | None:
+        """
+        Get only the updated_at timestamp of a user's preferences (None if absent).
+
+        Always read from Supabase: it backs the preferences ETag, and a
+        per-worker cached value would answer 304 for a row changed elsewhere.
+        """
+        try:
+            response = await execute_with_retry(
+                self._table.select("updated_at")
+                .eq("user_id", str(user_id))
+                .maybe_single()
+            )
+        except SUPABASE_ERRORS as e:
+            logger.warning("get_version failed: %s", e)
+            return None
+
+        if not response or not response.data or not response.data.get("updated_at"):
             return None
+        return datetime.fromisoformat(response.data["updated_at"])
 
-    def create_or_update(
+    async def create_or_update(
         self,
         user_id: UUID,
         languages: list[str],
@@ -44,16 +144,20 @@ class UserPreferenceDAO:
         github_token: str | None = None,
         github_username: str | None = None,
     ) -> UserPreference:
-        """Create or update user preference"""
-        existing = self.get_by_user_id(user_id)
+        """
+        Create or update user preference in a single round-trip.
 
+        Upserts on the UNIQUE user_id; optional fields left as None keep their
+        current value (or the column default for a new row), and created_at is
+        only ever set by its default.
+        """
         data = {
             "user_id": str(user_id),
             "languages": languages,
             "skills": skills,
             "project_interests": project_interests,
             "issue_interests": issue_interests,
-            "updated_at": datetime.utcnow().isoformat(),
+            "updated_at": datetime.now(UTC).isoformat(),
         }
 
         # Only include optional fields if provided
@@ -64,22 +168,61 @@ class UserPreferenceDAO:
         if github_username is not None:
             data["github_username"] = github_username
 
-        if existing:
-            # Update existing
-            response = (
-                self.supabase.table(self.table)
-                .update(data)
-                .eq("user_id", str(user_id))
-                .execute()
+        response = await execute_with_retry(
+            self._table.upsert(data, on_conflict="user_id", default_to_null=False)
+        )
+        invalidate_cached_preference(user_id)
+        return self._dict_to_model(response.data[0] if response.data else data)
+
+    async def insert_if_absent(
+        self,
+        user_id: UUID,
+        languages: list[str],
+        skills: list[dict],
+        project_interests: list[str],
+        issue_interests: list[str],
+        user_name: str | None = None,
+        github_token: str | None = None,
+        github_username: str | None = None,
+    ) -> UserPreference | None:
+        """
+        Create user preference in a single round-trip.
+
+        Relies on the UNIQUE constraint on user_id instead of checking for an
+        existing row first. Returns None if the user already has preferences.
+        """
+        now = datetime.now(UTC).isoformat()
+        data = {
+            "user_id": str(user_id),
+            "languages": languages,
+            "skills": skills,
+            "project_interests": project_interests,
+            "issue_interests": issue_interests,
+            "created_at": now,
+            "updated_at": now,
+        }
+
+        # Only include optional fields if provided
+        if user_name is not None:
+            data["user_name"] = user_name
+        if github_token is not None:
+            data["github_token"] = github_token
+        if github_username is not None:
+            data["github_username"] = github_username
+
+        try:
+            response = await execute_with_retry(
+                self._table.insert(data), idempotent=False
             )
-            return self._dict_to_model(response.data[0] if response.data else data)
-        else:
-            # Create new
-            data["created_at"] = datetime.utcnow().isoformat()
-            response = self.supabase.table(self.table).insert(data).execute()
-            return self._dict_to_model(response.data[0] if response.data else data)
-
-    def update_partial(
+        except PostgrestAPIError as e:
+            if e.code == UNIQUE_VIOLATION:
+                return None
+            raise
+        invalidate_cached_preference(user_id)
+
+        return self._dict_to_model(response.data[0] if response.data else data)
+
+    async def upsert_partial(
         self,
         user_id: UUID,
         user_name: str | None = None,
@@ -87,113 +230,86 @@ class UserPreferenceDAO:
         skills: list[dict] | None = None,
         project_interests: list[str] | None = None,
         issue_interests: list[str] | None = None,
-    ) -> UserPreference | None:
-        """Partially update user preference (only provided fields)"""
-        existing = self.get_by_user_id(user_id)
-
-        if not existing:
-            return None
+    ) -> UserPreference:
+        """
+        Update only the provided fields, creating the row if it doesn't exist.
 
-        update_data = {"updated_at": datetime.utcnow().isoformat()}
+        A single PostgREST upsert on user_id (the row comes back via RETURNING):
+        existing rows keep every column not in the payload, and new rows fall
+        back to the column defaults.
+        """
+        data = {
+            "user_id": str(user_id),
+            "updated_at": datetime.now(UTC).isoformat(),
+        }
         if user_name is not None:
-            update_data["user_name"] = user_name
+            data["user_name"] = user_name
         if languages is not None:
-            update_data["languages"] = languages
+            data["languages"] = languages
         if skills is not None:
-            update_data["skills"] = skills
+            data["skills"] = skills
         if project_interests is not None:
-            update_data["project_interests"] = project_interests
+            data["project_interests"] = project_interests
         if issue_interests is not None:
-            update_data["issue_interests"] = issue_interests
+            data["issue_interests"] = issue_interests
 
-        if len(update_data) > 1:  # More than just updated_at
-            response = (
-                self.supabase.table(self.table)
-                .update(update_data)
-                .eq("user_id", str(user_id))
-                .execute()
-            )
-            return self._dict_to_model(
-                response.data[0]
-                if response.data
-                else {**existing.__dict__, **update_data}
-            )
-        return existing
+        response = await execute_with_retry(
+            self._table.upsert(data, on_conflict="user_id", default_to_null=False)
+        )
+        invalidate_cached_preference(user_id)
+        return self._dict_to_model(response.data[0] if response.data else data)
 
-    def update_github(
+    async def update_github(
         self,
         user_id: UUID,
         github_token: str | None,
         github_username: str | None,
     ) -> UserPreference | None:
-        """Update GitHub token and username for a user"""
-        existing = self.get_by_user_id(user_id)
-
-        if not existing:
-            return None
+        """
+        Update GitHub token and username for a user.
 
+        A single UPDATE; returns None when the user has no preferences row
+        (nothing was updated).
+        """
         update_data = {
             "github_token": github_token,
             "github_username": github_username,
-            "updated_at": datetime.utcnow().isoformat(),
+            "updated_at": datetime.now(UTC).isoformat(),
         }
 
-        response = (
-            self.supabase.table(self.table)
-            .update(update_data)
-            .eq("user_id", str(user_id))
-            .execute()
+        response = await execute_with_retry(
+            self._table.update(update_data).eq("user_id", str(user_id))
         )
+        invalidate_cached_preference(user_id)
 
-        return self._dict_to_model(
-            response.data[0] if response.data else {**existing.__dict__, **update_data}
-        )
+        if not response.data:
+            return None
+        return self._dict_to_model(response.data[0])
 
-    def delete_by_user_id(self, user_id: UUID) -> bool:
+    async def delete_by_user_id(self, user_id: UUID) -> bool:
         """Delete user preference by user_id"""
         try:
-            response = (
-                self.supabase.table(self.table)
-                .delete()
-                .eq("user_id", str(user_id))
-                .execute()
+            response = await execute_with_retry(
+                self._table.delete().eq("user_id", str(user_id))
             )
+            invalidate_cached_preference(user_id)
             return len(response.data) > 0 if response.data else False
-        except Exception:
+        except SUPABASE_ERRORS as e:
+            logger.warning("delete_by_user_id failed: %s", e)
             return False
 
     def _dict_to_model(self, data: dict) -> UserPreference:
-        """Convert dictionary to UserPreference model"""
-
-        # Create a simple object that mimics the SQLAlchemy model
-        class PreferenceObj:
-            def __init__(self, data: dict):
-                self.id = (
-                    UUID(data["id"])
-                    if isinstance(data.get("id"), str)
-                    else data.get("id")
-                )
-                self.user_id = (
-                    UUID(data["user_id"])
-                    if isinstance(data.get("user_id"), str)
-                    else data.get("user_id")
-                )
-                self.user_name = data.get("user_name")
-                self.languages = data.get("languages", [])
-                self.skills = data.get("skills", [])
-                self.project_interests = data.get("project_interests", [])
-                self.issue_interests = data.get("issue_interests", [])
-                self.github_token = data.get("github_token")
-                self.github_username = data.get("github_username")
-                self.created_at = (
-                    datetime.fromisoformat(data["created_at"].replace("Z", "+00:00"))
-                    if isinstance(data.get("created_at"), str)
-                    else data.get("created_at")
-                )
-                self.updated_at = (
-                    datetime.fromisoformat(data["updated_at"].replace("Z", "+00:00"))
-                    if isinstance(data.get("updated_at"), str)
-                    else data.get("updated_at")
-                )
-
-        return PreferenceObj(data)
+        """Convert dictionary to a PreferenceRecord (duck-typed as UserPreference)"""
+        return PreferenceRecord(
+            id=_as_uuid(data.get("id")),
+            user_id=_as_uuid(data.get("user_id")),
+            user_name=data.get("user_name"),
+            languages=data.get("languages", []),
+            skills=data.get("skills", []),
+            project_interests=data.get("project_interests", []),
+            issue_interests=data.get("issue_interests", []),
+            github_token=data.get("github_token"),
+            github_username=data.get("github_username"),
+            created_at=_as_datetime(data.get("created_at")),
+            updated_at=_as_datetime(data.get("updated_at")),
+        )
@@ -1,9 +1,9 @@
 """Agent DTO - Data Transfer Objects for Agent communication"""
 
 from enum import Enum
-from typing import Any, Literal
+from typing import Annotated, Any, Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
 
 class AgentStep(str, Enum):
@@ -39,7 +39,13 @@ class AgentImplementRequest(BaseModel):
     )
 
 
-class AgentStatusEvent(BaseModel):
+class AgentEventBase(BaseModel):
+    """Base for streamed agent events (built once, serialized, then discarded)"""
+
+    model_config = ConfigDict(frozen=True)
+
+
+class AgentStatusEvent(AgentEventBase):
     """Status update event during agent execution"""
 
     type: Literal["status"] = "status"
@@ -47,14 +53,14 @@ class AgentStatusEvent(BaseModel):
     message: str
 
 
-class AgentThinkingEvent(BaseModel):
+class AgentThinkingEvent(AgentEventBase):
     """Agent thinking/reasoning event"""
 
     type: Literal["thinking"] = "thinking"
     content: str
 
 
-class AgentToolEvent(BaseModel):
+class AgentToolEvent(AgentEventBase):
     """Tool execution event"""
 
     type: Literal["tool"] = "tool"
@@ -63,7 +69,7 @@ class AgentToolEvent(BaseModel):
     tool_result: str | None = None
 
 
-class AgentSolutionEvent(BaseModel):
+class AgentSolutionEvent(AgentEventBase):
     """Final solution event with session_id for subsequent implement call"""
 
     type: Literal["solution"] = "solution"
@@ -76,27 +82,27 @@ class AgentSolutionEvent(BaseModel):
     )
 
 
-class AgentErrorEvent(BaseModel):
+class AgentErrorEvent(AgentEventBase):
     """Error event"""
 
     type: Literal["error"] = "error"
     message: str
 
 
-class AgentDoneEvent(BaseModel):
+class AgentDoneEvent(AgentEventBase):
     """Done event signaling completion"""
 
     type: Literal["done"] = "done"
 
 
-class AgentDiffEvent(BaseModel):
+class AgentDiffEvent(AgentEventBase):
     """Diff event showing code changes"""
 
     type: Literal["diff"] = "diff"
     data: str = Field(..., description="Git diff output")
 
 
-class AgentImplementResultEvent(BaseModel):
+class AgentImplementResultEvent(AgentEventBase):
     """Result event after successful implementation"""
 
     type: Literal["result"] = "result"
@@ -108,8 +114,9 @@ class AgentImplementResultEvent(BaseModel):
     diff: str = Field(..., description="Git diff of the changes")
 
 
-# Union type for all agent events
-AgentEvent = (
+# Union type for all agent events, discriminated on the `type` literal so
+# Pydantic dispatches straight to the matching model instead of trying each
+AgentEvent = Annotated[
     AgentStatusEvent
     | AgentThinkingEvent
     | AgentToolEvent
@@ -117,8 +124,17 @@ AgentEvent = (
     | AgentErrorEvent
     | AgentDoneEvent
     | AgentDiffEvent
-    | AgentImplementResultEvent
-)
+    | AgentImplementResultEvent,
+    Field(discriminator="type"),
+]
+
+# Built once at import; use for serializing and parsing any AgentEvent
+AGENT_EVENT_ADAPTER: TypeAdapter[AgentEvent] = TypeAdapter(AgentEvent)
+
+
+def dump_event(event: AgentEvent) -> bytes:
+    """Serialize an agent event to compact JSON bytes (Pydantic's Rust serializer)"""
+    return AGENT_EVENT_ADAPTER.dump_json(event)
 
 
 # =============================================================================
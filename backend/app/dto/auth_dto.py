@@ -1,5 +1,7 @@
 """Authentication DTOs"""
 
+from uuid import UUID
+
 from pydantic import BaseModel, EmailStr, field_validator
 
 
@@ -9,24 +11,6 @@ class RegisterDTO(BaseModel):
     email: EmailStr
     password: str
 
-    @field_validator("email")
-    @classmethod
-    def validate_email(cls, v: str) -> str:
-        """Validate email format with helpful error message"""
-        # EmailStr already validates, but we can add custom message
-        # Check for common mistakes
-        if "@" not in v:
-            raise ValueError("Email must contain '@' symbol (e.g., user@example.com)")
-        parts = v.split("@")
-        if len(parts) != 2:
-            raise ValueError("Invalid email format. Expected format: user@domain.com")
-        if not parts[1] or "." not in parts[1]:
-            raise ValueError(
-                "Invalid email format. Domain must include a top-level domain "
-                "(e.g., user@example.com, not user@123)"
-            )
-        return v
-
     @field_validator("password")
     @classmethod
     def validate_password(cls, v: str) -> str:
@@ -55,7 +39,7 @@ class TokenDTO(BaseModel):
 class UserResponseDTO(BaseModel):
     """User information response"""
 
-    id: str
+    id: UUID
     email: str
     created_at: str | None = None
 
@@ -2,6 +2,8 @@
 
 from pydantic import BaseModel, field_validator
 
+from ..utils.urls import normalize_repo_url
+
 
 class ContributionAnalysisQueryDTO(BaseModel):
     """Query parameters for contribution analysis"""
@@ -16,14 +18,7 @@ class ContributionAnalysisQueryDTO(BaseModel):
         if not v:
             raise ValueError("repo_url is required")
 
-        v = v.strip()
-        if not v.startswith(("http://", "https://")):
-            if "github.com" in v:
-                v = f"https://{v}" if not v.startswith("//") else f"https:{v}"
-            else:
-                v = f"https://{v}"
-
-        return v
+        return normalize_repo_url(v)
 
     @field_validator("days_back")
     @classmethod
@@ -4,6 +4,8 @@ from datetime import datetime
 
 from pydantic import BaseModel, field_validator
 
+from ..utils.urls import normalize_repo_url
+
 
 class IssueFilterDTO(BaseModel):
     """Issue filter request parameters"""
@@ -21,16 +23,7 @@ class IssueFilterDTO(BaseModel):
         if not v:
             raise ValueError("repo_url is required")
 
-        # Ensure URL has protocol
-        v = v.strip()
-        if not v.startswith(("http://", "https://")):
-            # If it's a GitHub URL without protocol, add https://
-            if "github.com" in v:
-                v = f"https://{v}" if not v.startswith("//") else f"https:{v}"
-            else:
-                v = f"https://{v}"
-
-        return v
+        return normalize_repo_url(v)
 
 
 class IssueDTO(BaseModel):
@@ -46,4 +39,6 @@ class IssueDTO(BaseModel):
     is_assigned: bool
     comments_count: int
 
-    model_config = {"from_attributes": True}
+
+# Bulk builders call the compiled validator directly, skipping BaseModel.__init__
+ISSUE_VALIDATOR = IssueDTO.__pydantic_validator__
@@ -25,4 +25,6 @@ class RepoDTO(BaseModel):
     topics: list[str]
     good_first_issue_count: int
 
-    model_config = {"from_attributes": True}
+
+# Bulk builders call the compiled validator directly, skipping BaseModel.__init__
+REPO_VALIDATOR = RepoDTO.__pydantic_validator__
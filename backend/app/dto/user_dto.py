@@ -1,12 +1,13 @@
 """User Preference DTOs"""
 
+import sys
 from datetime import datetime
 from uuid import UUID
 
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel
 
 from ..models.user_preference import (
-    SKILL_CATEGORY_MAP,
+    SKILL_CATEGORY_VALUES,
     Familiarity,
     IssueInterest,
     ProjectInterest,
@@ -15,28 +16,39 @@ from ..models.user_preference import (
     SkillName,
 )
 
+# Stored skill fields come from a small closed set (the enum values); map each
+# to one shared interned str so hydrated DTOs don't each hold fresh copies
+_SKILL_STRINGS = {
+    m.value: sys.intern(m.value)
+    for enum in (SkillName, SkillCategory, Familiarity)
+    for m in enum
+}
+_shared_str = _SKILL_STRINGS.get
+
+
+def _category_of(name: str) -> str:
+    """Category value for a stored skill name (categories are not stored)"""
+    return _SKILL_STRINGS[SKILL_CATEGORY_VALUES.get(name, SkillCategory.OTHER.value)]
+
 
 class SkillInputDTO(BaseModel):
-    """Skill input for creating/updating preferences"""
+    """
+    Skill input for creating/updating preferences.
+
+    The category is derived from the name; a category sent by older clients
+    is ignored.
+    """
 
     name: SkillName
     familiarity: Familiarity
-    category: SkillCategory | None = None  # Auto-resolved if not provided
-
-    @field_validator("category", mode="before")
-    @classmethod
-    def resolve_category(cls, v, info):
-        """Auto-resolve category from skill name if not provided"""
-        if v is None and "name" in info.data:
-            return SKILL_CATEGORY_MAP.get(info.data["name"], SkillCategory.OTHER)
-        return v
 
     def to_skill(self) -> Skill:
-        """Convert to Skill model"""
-        category = self.category or SKILL_CATEGORY_MAP.get(
-            self.name, SkillCategory.OTHER
-        )
-        return Skill(name=self.name, category=category, familiarity=self.familiarity)
+        """Convert to Skill model (category resolved from the name)"""
+        return Skill.create(self.name, self.familiarity)
+
+    def to_dict(self) -> dict:
+        """Convert to the stored dict form"""
+        return self.to_skill().to_dict()
 
 
 class SkillDTO(BaseModel):
@@ -49,22 +61,30 @@ class SkillDTO(BaseModel):
     @classmethod
     def from_skill(cls, skill: Skill) -> "SkillDTO":
         """Create from Skill model"""
-        return cls(
-            name=skill.name.value,
-            category=skill.category.value,
-            familiarity=skill.familiarity.value,
+        return SKILL_VALIDATOR.validate_python(
+            {
+                "name": skill.name.value,
+                "category": skill.category.value,
+                "familiarity": skill.familiarity.value,
+            }
         )
 
     @classmethod
     def from_dict(cls, data: dict) -> "SkillDTO":
         """Create from dictionary"""
-        return cls(
-            name=data["name"],
-            category=data["category"],
-            familiarity=data["familiarity"],
+        return SKILL_VALIDATOR.validate_python(
+            {
+                "name": _shared_str(data["name"], data["name"]),
+                "category": _category_of(data["name"]),
+                "familiarity": _shared_str(data["familiarity"], data["familiarity"]),
+            }
         )
 
 
+# Called directly by the builders above, skipping BaseModel.__init__
+SKILL_VALIDATOR = SkillDTO.__pydantic_validator__
+
+
 class UserPreferenceCreateDTO(BaseModel):
     """User preference creation request"""
 
@@ -106,9 +126,22 @@ class UserPreferenceDTO(BaseModel):
 
     @classmethod
     def from_model(cls, model) -> "UserPreferenceDTO":
-        """Create from SQLAlchemy model"""
-        skills = [SkillDTO.from_dict(s) for s in (model.skills or [])]
-        return cls(
+        """
+        Create from a stored preference (SQLAlchemy model or PreferenceRecord).
+
+        The row was validated on write and arrives with typed UUIDs and
+        datetimes, so both the DTO and its skills are built with
+        model_construct instead of being validated again.
+        """
+        skills = [
+            SkillDTO.model_construct(
+                name=_shared_str(s["name"], s["name"]),
+                category=_category_of(s["name"]),
+                familiarity=_shared_str(s["familiarity"], s["familiarity"]),
+            )
+            for s in (model.skills or [])
+        ]
+        return cls.model_construct(
             id=model.id,
             user_id=model.user_id,
             user_name=model.user_name,
@@ -122,8 +155,6 @@ class UserPreferenceDTO(BaseModel):
             updated_at=model.updated_at,
         )
 
-    model_config = {"from_attributes": True}
-
 
 class GitHubConnectDTO(BaseModel):
     """Request to connect GitHub account"""
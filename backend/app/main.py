@@ -4,17 +4,36 @@ import logging
 import sys
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Request, status
+import httpx
+from fastapi import APIRouter, FastAPI, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 
 from .config import get_settings
 from .controllers.agent_controller import router as agent_router
 from .controllers.auth_controller import router as auth_router
+from .controllers.contribution_controller import router as contribution_router
 from .controllers.github_oauth_controller import router as oauth_router
 from .controllers.issue_controller import router as issue_router
 from .controllers.repo_controller import router as repo_router
+from .services.contribution_service import ContributionService
+from .services.github_oauth_service import GitHubOAuthService
+from .services.github_service import GitHubService
+from .utils.dependencies import get_optional_openrouter_service, get_user_cache_stats
+from .utils.supabase_client import get_async_supabase_client
+
+_INVALID_EMAIL_MESSAGE = (
+    "Invalid email format. Please use a valid email address (e.g., user@example.com)"
+)
+
+# Validation error types with a fixed friendly message; other types fall back
+# to inspecting the field name and message text
+_FRIENDLY_ERROR_KINDS = {
+    "value_error.email": "email",
+    "missing": "required",
+}
 
 
 def setup_logging():
@@ -55,7 +74,7 @@ def setup_logging():
         logger.setLevel(log_level)
         logger.propagate = True
 
-    logging.info(f"Logging configured with level: {logging.getLevelName(log_level)}")
+    logging.info("Logging configured with level: %s", logging.getLevelName(log_level))
 
 
 @asynccontextmanager
@@ -64,14 +83,42 @@ async def lifespan(app: FastAPI):
     # Startup
     setup_logging()
     settings = get_settings()
-    logging.info(f"Starting {settings.app_name}...")
-    logging.info(f"Debug mode: {settings.debug}")
-    logging.info(f"E2B configured: {bool(settings.e2b_api_key)}")
-    logging.info(f"OpenRouter configured: {bool(settings.openrouter_api_key)}")
-    logging.info(f"OpenRouter model: {settings.openrouter_model}")
+    logging.info("Starting %s...", settings.app_name)
+    logging.info("Debug mode: %s", settings.debug)
+    logging.info("E2B configured: %s", bool(settings.e2b_api_key))
+    logging.info("OpenRouter configured: %s", bool(settings.openrouter_api_key))
+    logging.info("OpenRouter model: %s", settings.openrouter_model)
+
+    # Build the Supabase client once so every request shares its connection pool
+    try:
+        app.state.supabase = await get_async_supabase_client()
+    except ValueError as e:
+        app.state.supabase = None
+        logging.warning("Supabase not configured: %s", e)
+
+    # One pooled HTTP/2 client for GitHub calls, reused across requests
+    app.state.gh_client = httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+        timeout=10.0,
+        follow_redirects=True,
+    )
+
+    # Stateless services are built once and shared by every request
+    try:
+        app.state.oauth_service = GitHubOAuthService(app.state.gh_client)
+    except ValueError as e:
+        app.state.oauth_service = None
+        logging.warning("GitHub OAuth not configured: %s", e)
+    app.state.contribution_service = ContributionService()
+    app.state.github_service = GitHubService(client=app.state.gh_client)
+    # Resolve LLM ranking once; routes get None (the GitHub-only path) without a key
+    app.state.openrouter_service = get_optional_openrouter_service()
+
     yield
     # Shutdown
     logging.info("Shutting down...")
+    await app.state.gh_client.aclose()
 
 
 def create_app() -> FastAPI:
@@ -83,6 +130,7 @@ def create_app() -> FastAPI:
         description="OpenQuest Backend API - Find and contribute to open source projects",
         version="0.1.0",
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
         docs_url="/docs",
         redoc_url="/redoc",
         openapi_url="/openapi.json",
@@ -97,6 +145,10 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    # Compress large JSON (e.g. contribution heatmaps); small auth/OAuth
+    # responses stay under minimum_size and SSE streams are never buffered
+    app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
     # Add validation error handler for better error messages
     @app.exception_handler(RequestValidationError)
     async def validation_exception_handler(
@@ -105,16 +157,21 @@ def create_app() -> FastAPI:
         """Handle validation errors with detailed messages"""
         errors = []
         for error in exc.errors():
-            field = " -> ".join(str(loc) for loc in error["loc"])
+            field = " -> ".join(map(str, error["loc"]))
             message = error["msg"]
             error_type = error.get("type", "")
 
             # Provide user-friendly error messages
-            if error_type == "value_error.email" or (
-                "email" in field.lower() and "value" in message.lower()
-            ):
-                message = "Invalid email format. Please use a valid email address (e.g., user@example.com)"
-            elif "required" in message.lower():
+            kind = _FRIENDLY_ERROR_KINDS.get(error_type)
+            if kind is None:
+                msg_lower = message.lower()
+                if "email" in field.lower() and "value" in msg_lower:
+                    kind = "email"
+                elif "required" in msg_lower:
+                    kind = "required"
+            if kind == "email":
+                message = _INVALID_EMAIL_MESSAGE
+            elif kind == "required":
                 message = f"Field '{field}' is required"
 
             errors.append(
@@ -125,7 +182,7 @@ def create_app() -> FastAPI:
                 }
             )
 
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             content={
                 "detail": "Validation error",
@@ -135,12 +192,18 @@ def create_app() -> FastAPI:
             },
         )
 
-    # Include routers
-    app.include_router(auth_router, prefix="/api/v1")
-    app.include_router(issue_router, prefix="/api/v1")
-    app.include_router(repo_router, prefix="/api/v1")
-    app.include_router(agent_router, prefix="/api/v1")
-    app.include_router(oauth_router, prefix="/api/v1")
+    # Include routers under one versioned parent, mounted once
+    api_v1 = APIRouter(prefix="/api/v1")
+    for router in (
+        auth_router,
+        issue_router,
+        repo_router,
+        agent_router,
+        oauth_router,
+        contribution_router,
+    ):
+        api_v1.include_router(router)
+    app.include_router(api_v1)
 
     @app.get("/", tags=["Health"])
     async def root():
@@ -154,7 +217,7 @@ def create_app() -> FastAPI:
     @app.get("/health", tags=["Health"])
     async def health_check():
         """Health check endpoint"""
-        return {"status": "ok"}
+        return {"status": "ok", "auth_cache": get_user_cache_stats()}
 
     return app
 
@@ -164,11 +227,18 @@ app = create_app()
 
 
 if __name__ == "__main__":
+    import os
+
     import uvicorn
 
+    settings = get_settings()
+    # Each worker is its own process with its own services, caches and limits
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        loop="uvloop",
+        http="httptools",
+        reload=settings.debug,
+        workers=1 if settings.debug else settings.web_concurrency or os.cpu_count(),
     )
@@ -5,7 +5,7 @@ from enum import Enum
 from uuid import UUID
 
 from pydantic import BaseModel
-from sqlalchemy import ARRAY, DateTime, String, func
+from sqlalchemy import ARRAY, DateTime, Index, String, func
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
@@ -123,6 +123,13 @@ SKILL_CATEGORY_MAP: dict[SkillName, SkillCategory] = {
     SkillName.AZURE: SkillCategory.CLOUD,
 }
 
+# Category is derived from the name and not stored with the skill; this is the
+# same mapping keyed and valued by plain strings, for reading stored skill dicts
+SKILL_CATEGORY_VALUES: dict[str, str] = {
+    name.value: SKILL_CATEGORY_MAP.get(name, SkillCategory.OTHER).value
+    for name in SkillName
+}
+
 
 class ProjectInterest(str, Enum):
     """Project type interests - what kind of projects you want to work on"""
@@ -185,19 +192,19 @@ class Skill(BaseModel):
         return cls(name=name, category=category, familiarity=familiarity)
 
     def to_dict(self) -> dict:
-        """Convert to dictionary for JSON storage"""
+        """Convert to dictionary for JSON storage (category is derived, not stored)"""
         return {
             "name": self.name.value,
-            "category": self.category.value,
             "familiarity": self.familiarity.value,
         }
 
     @classmethod
     def from_dict(cls, data: dict) -> "Skill":
-        """Create from dictionary"""
+        """Create from dictionary, resolving category from the skill name"""
+        name = SkillName(data["name"])
         return cls(
-            name=SkillName(data["name"]),
-            category=SkillCategory(data["category"]),
+            name=name,
+            category=SKILL_CATEGORY_MAP.get(name, SkillCategory.OTHER),
             familiarity=Familiarity(data["familiarity"]),
         )
 
@@ -212,6 +219,27 @@ class UserPreference(Base):
     """User Preference Model - stored in local database"""
 
     __tablename__ = "user_preferences"
+    __table_args__ = (
+        # Serves `skills @> '[{"name": ...}]'` containment lookups (migration 010)
+        Index(
+            "idx_user_preferences_skills",
+            "skills",
+            postgresql_using="gin",
+            postgresql_ops={"skills": "jsonb_path_ops"},
+        ),
+        # Serve `&&` (any of) and `@>` (all of) array matching (migration 011)
+        Index("idx_user_preferences_languages", "languages", postgresql_using="gin"),
+        Index(
+            "idx_user_preferences_project_interests",
+            "project_interests",
+            postgresql_using="gin",
+        ),
+        Index(
+            "idx_user_preferences_issue_interests",
+            "issue_interests",
+            postgresql_using="gin",
+        ),
+    )
 
     id: Mapped[UUID] = mapped_column(
         PGUUID(as_uuid=True),
@@ -233,7 +261,7 @@ class UserPreference(Base):
     skills: Mapped[list[dict]] = mapped_column(
         JSONB,
         default=list,
-        comment="List of Skill objects with name, category, familiarity",
+        comment="List of Skill objects with name, familiarity (category derived)",
     )
     project_interests: Mapped[list[str]] = mapped_column(
         ARRAY(String),
@@ -2,7 +2,7 @@
 
 import logging
 
-from supabase import Client
+from supabase import AsyncClient
 
 from ..dto.auth_dto import LoginDTO, RegisterDTO, TokenDTO, UserResponseDTO
 
@@ -12,10 +12,10 @@ logger = logging.getLogger(__name__)
 class AuthService:
     """Service for handling Supabase authentication operations"""
 
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: AsyncClient):
         self.supabase = supabase
 
-    def register(self, data: RegisterDTO) -> UserResponseDTO:
+    async def register(self, data: RegisterDTO) -> UserResponseDTO:
         """
         Register a new user.
 
@@ -28,7 +28,7 @@ class AuthService:
             if len(data.password) < 6:
                 raise ValueError("Password must be at least 6 characters long")
 
-            response = self.supabase.auth.sign_up(
+            response = await self.supabase.auth.sign_up(
                 {
                     "email": data.email,
                     "password": data.password,
@@ -78,9 +78,9 @@ class AuthService:
             else:
                 raise ValueError(f"Registration failed: {error_msg}")
 
-    def login(self, data: LoginDTO) -> TokenDTO:
+    async def login(self, data: LoginDTO) -> TokenDTO:
         """Login user and return tokens"""
-        response = self.supabase.auth.sign_in_with_password(
+        response = await self.supabase.auth.sign_in_with_password(
             {
                 "email": data.email,
                 "password": data.password,
@@ -96,18 +96,18 @@ class AuthService:
             expires_in=response.session.expires_in,
         )
 
-    def logout(self, access_token: str) -> bool:
+    async def logout(self, access_token: str) -> bool:
         """Logout user (invalidate session)"""
         try:
-            self.supabase.auth.sign_out()
+            await self.supabase.auth.sign_out()
             return True
         except Exception:
             return False
 
-    def get_user(self, access_token: str) -> UserResponseDTO | None:
+    async def get_user(self, access_token: str) -> UserResponseDTO | None:
         """Get current user information from token"""
         try:
-            response = self.supabase.auth.get_user(access_token)
+            response = await self.supabase.auth.get_user(access_token)
             if response.user:
                 return UserResponseDTO(
                     id=str(response.user.id),
@@ -120,10 +120,10 @@ class AuthService:
         except Exception:
             return None
 
-    def refresh_token(self, refresh_token: str) -> TokenDTO | None:
+    async def refresh_token(self, refresh_token: str) -> TokenDTO | None:
         """Refresh access token using refresh token"""
         try:
-            response = self.supabase.auth.refresh_session(refresh_token)
+            response = await self.supabase.auth.refresh_session(refresh_token)
             if response.session:
                 return TokenDTO(
                     access_token=response.session.access_token,
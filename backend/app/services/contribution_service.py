@@ -252,7 +252,7 @@ class ContributionService:
             timestamp = contrib["last_modified_timestamp"]
 
             if isinstance(timestamp, str):
-                timestamp = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+                timestamp = datetime.fromisoformat(timestamp)
 
             module_contribution_count[module] += contrib["commit_count"]
 
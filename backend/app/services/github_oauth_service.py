@@ -1,6 +1,8 @@
 """GitHub OAuth Service - Handle GitHub OAuth flow"""
 
 import secrets
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from typing import Any
 from urllib.parse import urlencode
 
@@ -17,8 +19,14 @@ class GitHubOAuthService:
     TOKEN_URL = "https://github.com/login/oauth/access_token"
     USER_API_URL = "https://api.github.com/user"
 
-    def __init__(self):
+    def __init__(self, client: httpx.AsyncClient | None = None):
+        """
+        Args:
+            client: Shared HTTP client to reuse across calls. If not given, a
+                short-lived client is created per call.
+        """
         settings = get_settings()
+        self._client = client
         self.client_id = settings.github_client_id
         self.client_secret = settings.github_client_secret
         self.redirect_uri = settings.github_redirect_uri
@@ -29,6 +37,24 @@ class GitHubOAuthService:
                 "Set GITHUB_CLIENT_ID and GITHUB_CLIENT_SECRET environment variables."
             )
 
+    @asynccontextmanager
+    async def _http(self) -> AsyncIterator[httpx.AsyncClient]:
+        """Yield the shared client, or a per-call client if none was injected"""
+        if self._client is not None:
+            yield self._client
+        else:
+            async with httpx.AsyncClient(timeout=30.0) as client:
+                yield client
+
+    @staticmethod
+    def _api_headers(access_token: str) -> dict[str, str]:
+        """Headers for a GitHub REST API call made with a user's token"""
+        return {
+            "Authorization": f"Bearer {access_token}",
+            "Accept": "application/vnd.github+json",
+            "X-GitHub-Api-Version": "2022-11-28",
+        }
+
     def generate_state(self) -> str:
         """Generate a random state token for CSRF protection"""
         return secrets.token_urlsafe(32)
@@ -76,7 +102,7 @@ class GitHubOAuthService:
             "Accept": "application/json",
         }
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with self._http() as client:
             try:
                 response = await client.post(
                     self.TOKEN_URL,
@@ -113,17 +139,11 @@ class GitHubOAuthService:
         Raises:
             GitHubOAuthError: If API call fails
         """
-        headers = {
-            "Authorization": f"Bearer {access_token}",
-            "Accept": "application/vnd.github+json",
-            "X-GitHub-Api-Version": "2022-11-28",
-        }
-
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with self._http() as client:
             try:
                 response = await client.get(
                     self.USER_API_URL,
-                    headers=headers,
+                    headers=self._api_headers(access_token),
                 )
                 response.raise_for_status()
                 data = response.json()
@@ -147,10 +167,29 @@ class GitHubOAuthService:
             access_token: GitHub OAuth access token
 
         Returns:
-            True if token is valid, False otherwise
+            True if GitHub accepts the token, False if it rejects it (401, or
+            403 without the rate limit being exhausted)
+
+        Raises:
+            GitHubOAuthError: If GitHub gave no definitive answer (network
+                error, timeout, 5xx or rate limit)
         """
-        try:
-            await self.get_user_info(access_token)
+        async with self._http() as client:
+            try:
+                response = await client.get(
+                    self.USER_API_URL,
+                    headers=self._api_headers(access_token),
+                )
+            except httpx.HTTPError as e:
+                raise GitHubOAuthError(f"Failed to validate token: {e}")
+
+        if response.is_success:
             return True
-        except GitHubOAuthError:
+        if response.status_code == 401 or (
+            response.status_code == 403
+            and response.headers.get("x-ratelimit-remaining") != "0"
+        ):
             return False
+        raise GitHubOAuthError(
+            f"Failed to validate token: GitHub returned {response.status_code}"
+        )
@@ -1,23 +1,58 @@
 """GitHub API Integration Service"""
 
+import hashlib
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from datetime import datetime
+from typing import Any
 from urllib.parse import urlparse
 
 import httpx
+from cachetools import TTLCache
 
 from ..config import get_settings
-from ..dto.issue_dto import IssueDTO
-from ..dto.repo_dto import RepoDTO
+from ..dto.issue_dto import ISSUE_VALIDATOR, IssueDTO
+from ..dto.repo_dto import REPO_VALIDATOR, RepoDTO
+
+# Last (ETag, body) seen per URL and credential, revalidated with If-None-Match.
+# A 304 costs no rate limit; the TTL bounds staleness if GitHub stops sending ETags.
+ETAG_CACHE_TTL_SECONDS = 600
+_etag_cache: TTLCache = TTLCache(maxsize=4096, ttl=ETAG_CACHE_TTL_SECONDS)
+
+
+# Resolves fork status in one round-trip: the viewer's same-named repo (the
+# usual fork location) plus any upstream fork owned by the viewer (renamed forks)
+FORK_STATUS_QUERY = """
+query ($owner: String!, $name: String!) {
+  viewer {
+    repository(name: $name) {
+      isFork
+      url
+      nameWithOwner
+      parent { nameWithOwner }
+    }
+  }
+  repository(owner: $owner, name: $name) {
+    forks(first: 1, affiliations: [OWNER], ownerAffiliations: [OWNER]) {
+      nodes { url nameWithOwner }
+    }
+  }
+}
+"""
 
 
 class GitHubService:
     """Service for GitHub API integration"""
 
     BASE_URL = "https://api.github.com"
+    GRAPHQL_URL = "https://api.github.com/graphql"
 
-    def __init__(self, token: str | None = None):
+    def __init__(
+        self, token: str | None = None, client: httpx.AsyncClient | None = None
+    ):
         settings = get_settings()
         self.token = token or settings.github_token
+        self._client = client
         self.headers = {
             "Accept": "application/vnd.github+json",
             "X-GitHub-Api-Version": "2022-11-28",
@@ -25,6 +60,63 @@ class GitHubService:
         if self.token:
             self.headers["Authorization"] = f"Bearer {self.token}"
 
+    @asynccontextmanager
+    async def _http(self) -> AsyncIterator[httpx.AsyncClient]:
+        """Yield the shared client, or a per-call client if none was injected"""
+        if self._client is not None:
+            yield self._client
+        else:
+            async with httpx.AsyncClient(follow_redirects=True) as client:
+                yield client
+
+    async def _get_conditional(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        headers: dict[str, str],
+        timeout: float = 30.0,
+    ) -> httpx.Response:
+        """
+        GET a resource, revalidating a previously seen ETag.
+
+        On 304 the cached body is replayed as a 200 response, so callers handle
+        both cases the same way. Only successful responses are cached; the key
+        includes a digest of the Authorization header so tokens never share
+        entries.
+        """
+        auth = headers.get("Authorization", "")
+        key = (url, hashlib.blake2b(auth.encode(), digest_size=16).digest())
+        cached: tuple[str, bytes] | None = _etag_cache.get(key)
+
+        request_headers = headers
+        if cached is not None:
+            request_headers = {**headers, "If-None-Match": cached[0]}
+
+        response = await client.get(url, headers=request_headers, timeout=timeout)
+
+        if response.status_code == 304 and cached is not None:
+            return httpx.Response(
+                200,
+                content=cached[1],
+                headers={"Content-Type": "application/json", "ETag": cached[0]},
+                request=response.request,
+            )
+
+        etag = response.headers.get("ETag")
+        if response.status_code == 200 and etag:
+            _etag_cache[key] = (etag, response.content)
+        return response
+
+    async def _get_repo_data(
+        self, client: httpx.AsyncClient, owner: str, repo: str
+    ) -> dict[str, Any]:
+        """Fetch raw repository metadata (conditionally, see _get_conditional)"""
+        response = await self._get_conditional(
+            client, f"{self.BASE_URL}/repos/{owner}/{repo}", self.headers
+        )
+        response.raise_for_status()
+        return response.json()
+
     def _parse_repo_url(self, repo_url: str) -> tuple[str, str]:
         """Parse owner and repo from GitHub URL"""
         # Clean up the URL
@@ -62,6 +154,25 @@ class GitHubService:
         page: int = 1,
     ) -> list[IssueDTO]:
         """Get issues from a repository"""
+        issues, _ = await self.get_issues_page(repo_url, labels, state, per_page, page)
+        return issues
+
+    async def get_issues_page(
+        self,
+        repo_url: str,
+        labels: list[str] | None = None,
+        state: str = "open",
+        per_page: int = 20,
+        page: int = 1,
+    ) -> tuple[list[IssueDTO], bool]:
+        """
+        Get one page of issues from a repository.
+
+        Returns:
+            The page's issues (pull requests removed) and whether GitHub has a
+            next page, read from the Link header; the filtered count can't
+            tell, since a page full of pull requests comes back short or empty
+        """
         owner, repo = self._parse_repo_url(repo_url)
 
         params = {
@@ -75,16 +186,10 @@ class GitHubService:
             # Join labels with comma (GitHub expects comma-separated)
             params["labels"] = ",".join(labels)
 
-        async with httpx.AsyncClient(follow_redirects=True) as client:
+        async with self._http() as client:
             try:
                 # Fetch repository info first to get language (language is repo-level, not issue-level)
-                repo_response = await client.get(
-                    f"{self.BASE_URL}/repos/{owner}/{repo}",
-                    headers=self.headers,
-                    timeout=30.0,
-                )
-                repo_response.raise_for_status()
-                repo_data = repo_response.json()
+                repo_data = await self._get_repo_data(client, owner, repo)
                 repo_language = repo_data.get("language")
 
                 # Fetch issues
@@ -96,6 +201,7 @@ class GitHubService:
                 )
                 response.raise_for_status()
                 data = response.json()
+                has_next = "next" in response.links
             except httpx.HTTPStatusError as e:
                 if e.response.status_code == 404:
                     raise ValueError(f"Repository not found: {owner}/{repo}")
@@ -112,35 +218,31 @@ class GitHubService:
                 continue
 
             issues.append(
-                IssueDTO(
-                    id=item["id"],
-                    number=item["number"],  # Human-readable issue number
-                    title=item["title"],
-                    url=item["html_url"],
-                    labels=[label["name"] for label in item.get("labels", [])],
-                    language=repo_language,  # Use repository language (from repo API call)
-                    created_at=datetime.fromisoformat(
-                        item["created_at"].replace("Z", "+00:00")
-                    ),
-                    is_assigned=item.get("assignee") is not None
-                    or len(item.get("assignees", [])) > 0,
-                    comments_count=item.get("comments", 0),
+                ISSUE_VALIDATOR.validate_python(
+                    {
+                        "id": item["id"],
+                        "number": item["number"],  # Human-readable issue number
+                        "title": item["title"],
+                        "url": item["html_url"],
+                        "labels": [label["name"] for label in item.get("labels", [])],
+                        # Use repository language (from repo API call)
+                        "language": repo_language,
+                        "created_at": datetime.fromisoformat(item["created_at"]),
+                        "is_assigned": item.get("assignee") is not None
+                        or len(item.get("assignees", [])) > 0,
+                        "comments_count": item.get("comments", 0),
+                    }
                 )
             )
 
-        return issues
+        return issues, has_next
 
     async def get_repo_info(self, repo_url: str) -> RepoDTO:
         """Get repository information"""
         owner, repo = self._parse_repo_url(repo_url)
 
-        async with httpx.AsyncClient(follow_redirects=True) as client:
-            response = await client.get(
-                f"{self.BASE_URL}/repos/{owner}/{repo}",
-                headers=self.headers,
-            )
-            response.raise_for_status()
-            data = response.json()
+        async with self._http() as client:
+            data = await self._get_repo_data(client, owner, repo)
 
         # Get good first issue count
         good_first_issue_count = await self._get_label_issue_count(
@@ -163,7 +265,7 @@ class GitHubService:
     async def _get_label_issue_count(self, owner: str, repo: str, label: str) -> int:
         """Get count of unassigned issues with a specific label"""
         # Count unassigned issues with the label (matching what Issues page shows)
-        async with httpx.AsyncClient(follow_redirects=True) as client:
+        async with self._http() as client:
             unassigned_count = 0
             page = 1
             per_page = 100
@@ -253,7 +355,7 @@ class GitHubService:
 
         query = " ".join(query_parts) if query_parts else "stars:>=100"
 
-        async with httpx.AsyncClient(follow_redirects=True) as client:
+        async with self._http() as client:
             response = await client.get(
                 f"{self.BASE_URL}/search/repositories",
                 headers=self.headers,
@@ -279,17 +381,20 @@ class GitHubService:
                     continue  # Skip repos that don't match user's language preferences
 
             repos.append(
-                RepoDTO(
-                    id=item["id"],
-                    name=item["name"],
-                    full_name=item["full_name"],
-                    url=item["html_url"],
-                    description=item.get("description"),
-                    language=item.get("language") or "Unknown",
-                    stars=item.get("stargazers_count", 0),
-                    open_issues_count=item.get("open_issues_count", 0),
-                    topics=item.get("topics", []),
-                    good_first_issue_count=0,  # Would need separate API call for each
+                REPO_VALIDATOR.validate_python(
+                    {
+                        "id": item["id"],
+                        "name": item["name"],
+                        "full_name": item["full_name"],
+                        "url": item["html_url"],
+                        "description": item.get("description"),
+                        "language": item.get("language") or "Unknown",
+                        "stars": item.get("stargazers_count", 0),
+                        "open_issues_count": item.get("open_issues_count", 0),
+                        "topics": item.get("topics", []),
+                        # Would need separate API call for each
+                        "good_first_issue_count": 0,
+                    }
                 )
             )
 
@@ -303,6 +408,8 @@ class GitHubService:
         """
         Check if the authenticated user has forked a repository.
 
+        Uses a single GraphQL query instead of several REST lookups.
+
         Args:
             repo_url: URL of the repository to check
             user_token: GitHub OAuth token of the current user
@@ -316,6 +423,7 @@ class GitHubService:
             }
         """
         owner, repo = self._parse_repo_url(repo_url)
+        no_fork = {"has_fork": False, "fork_url": None, "fork_full_name": None}
 
         # Use user's token for this request
         headers = {
@@ -323,69 +431,59 @@ class GitHubService:
             "Authorization": f"Bearer {user_token}",
         }
 
-        async with httpx.AsyncClient(follow_redirects=True) as client:
+        async with self._http() as client:
             try:
-                # First, get the authenticated user's username
-                user_response = await client.get(
-                    f"{self.BASE_URL}/user",
-                    headers=headers,
-                    timeout=30.0,
-                )
-                user_response.raise_for_status()
-                username = user_response.json().get("login")
-
-                if not username:
-                    return {"has_fork": False, "fork_url": None, "fork_full_name": None}
-
-                # Check if user has a fork of this repo
-                # The fork would be at github.com/{username}/{repo}
-                fork_response = await client.get(
-                    f"{self.BASE_URL}/repos/{username}/{repo}",
-                    headers=headers,
-                    timeout=30.0,
-                )
-
-                if fork_response.status_code == 200:
-                    fork_data = fork_response.json()
-                    # Verify it's actually a fork of the original repo
-                    if (
-                        fork_data.get("fork")
-                        and fork_data.get("parent", {}).get("full_name")
-                        == f"{owner}/{repo}"
-                    ):
-                        return {
-                            "has_fork": True,
-                            "fork_url": fork_data.get("html_url"),
-                            "fork_full_name": fork_data.get("full_name"),
-                        }
-
-                # Also check forks list in case the fork has a different name
-                forks_response = await client.get(
-                    f"{self.BASE_URL}/repos/{owner}/{repo}/forks",
+                response = await client.post(
+                    self.GRAPHQL_URL,
                     headers=headers,
-                    params={"per_page": 100},
+                    json={
+                        "query": FORK_STATUS_QUERY,
+                        "variables": {"owner": owner, "name": repo},
+                    },
                     timeout=30.0,
                 )
-
-                if forks_response.status_code == 200:
-                    forks_data = forks_response.json()
-                    for fork in forks_data:
-                        if fork.get("owner", {}).get("login") == username:
-                            return {
-                                "has_fork": True,
-                                "fork_url": fork.get("html_url"),
-                                "fork_full_name": fork.get("full_name"),
-                            }
-
-                return {"has_fork": False, "fork_url": None, "fork_full_name": None}
-
+                response.raise_for_status()
+                payload = response.json()
             except httpx.HTTPStatusError as e:
-                if e.response.status_code == 404:
-                    return {"has_fork": False, "fork_url": None, "fork_full_name": None}
                 raise ValueError(f"GitHub API error: {e.response.status_code}")
             except Exception as e:
                 raise ValueError(f"Failed to check fork status: {str(e)}")
 
+        data = payload.get("data") or {}
+        upstream = data.get("repository")
+        if upstream is None:
+            # Upstream repository not found (or not visible to the user)
+            if payload.get("errors") and not data:
+                raise ValueError(
+                    f"GitHub API error: {payload['errors'][0].get('message')}"
+                )
+            return no_fork
+
+        # The fork usually keeps the upstream name under the user's account...
+        same_name = (data.get("viewer") or {}).get("repository")
+        if (
+            same_name
+            and same_name.get("isFork")
+            and (same_name.get("parent") or {}).get("nameWithOwner")
+            == f"{owner}/{repo}"
+        ):
+            return {
+                "has_fork": True,
+                "fork_url": same_name["url"],
+                "fork_full_name": same_name["nameWithOwner"],
+            }
+
+        # ...but may have been renamed, so also check the user's own forks
+        forks = upstream["forks"]["nodes"]
+        if forks:
+            return {
+                "has_fork": True,
+                "fork_url": forks[0]["url"],
+                "fork_full_name": forks[0]["nameWithOwner"],
+            }
+
+        return no_fork
+
     async def create_fork(
         self,
         repo_url: str,
@@ -413,7 +511,7 @@ class GitHubService:
             "Authorization": f"Bearer {user_token}",
         }
 
-        async with httpx.AsyncClient(follow_redirects=True) as client:
+        async with self._http() as client:
             try:
                 response = await client.post(
                     f"{self.BASE_URL}/repos/{owner}/{repo}/forks",
@@ -39,6 +39,19 @@ class IssueService:
         Returns:
             List of filtered and ranked issues
         """
+        issues = await self.filter_issues(filter_dto)
+        return await self.rank_issues(filter_dto, issues, user_preference)
+
+    async def filter_issues(self, filter_dto: IssueFilterDTO) -> list[IssueDTO]:
+        """
+        Fetch issues from GitHub and apply the filter criteria (no ranking).
+
+        Args:
+            filter_dto: Filter criteria for issues
+
+        Returns:
+            List of filtered issues, in GitHub order
+        """
         # GitHub API uses AND logic for multiple labels (all labels must match)
         # For OR logic (any label matches), we fetch without labels and filter client-side
         use_client_side_label_filter = len(filter_dto.tags) > 1
@@ -57,7 +70,7 @@ class IssueService:
             # Fetch more pages to ensure we get unassigned issues
             # GitHub returns issues in order, and if first pages are all assigned,
             # we need to fetch more to find unassigned ones
-            issues = await self.github_service.get_issues(
+            issues, has_next = await self.github_service.get_issues_page(
                 repo_url=str(filter_dto.repo_url),
                 labels=filter_dto.tags if filter_dto.tags else None,
                 per_page=100,  # Fetch more per page
@@ -71,16 +84,16 @@ class IssueService:
                 # Fetch more pages to find unassigned issues
                 page = 2
                 max_pages = 5  # Limit to 5 pages (500 issues) for performance
-                while page <= max_pages:
-                    additional_issues = await self.github_service.get_issues(
+                # Continue while GitHub reports a next page (its Link header), not
+                # while the PR-filtered page looks full
+                while has_next and page <= max_pages:
+                    batch, has_next = await self.github_service.get_issues_page(
                         repo_url=str(filter_dto.repo_url),
                         labels=filter_dto.tags if filter_dto.tags else None,
                         per_page=100,
                         page=page,
                     )
-                    if not additional_issues:
-                        break
-                    issues.extend(additional_issues)
+                    issues.extend(batch)
                     # Check if we have enough unassigned issues
                     unassigned_count = len([i for i in issues if not i.is_assigned])
                     if unassigned_count >= filter_dto.limit:
@@ -108,6 +121,25 @@ class IssueService:
 
             filtered_issues.append(issue)
 
+        return filtered_issues
+
+    async def rank_issues(
+        self,
+        filter_dto: IssueFilterDTO,
+        filtered_issues: list[IssueDTO],
+        user_preference=None,
+    ) -> list[IssueDTO]:
+        """
+        Rank filtered issues with AI when possible, otherwise keep GitHub order.
+
+        Args:
+            filter_dto: Filter criteria for issues (repo_url and limit)
+            filtered_issues: Issues returned by filter_issues
+            user_preference: User's preference model (optional, for AI ranking)
+
+        Returns:
+            List of at most filter_dto.limit issues
+        """
         # Try AI-powered ranking if OpenRouter is available and user has preferences
         if self.openrouter_service and user_preference and filtered_issues:
             try:
@@ -1,10 +1,13 @@
 """OpenRouter LLM Service - API Integration for LLM-based Recommendations"""
 
+import hashlib
 import json
 import logging
 from typing import Any
 
 import httpx
+import orjson
+from cachetools import TTLCache
 
 from ..config import get_settings
 
@@ -36,6 +39,14 @@ class OpenRouterService:
             "X-Title": "OpenQuest",
         }
 
+        # Ranking prompts are a pure function of (preferences, candidates, filter),
+        # so identical requests within the TTL reuse the previous completion
+        self._json_cache: TTLCache | None = (
+            TTLCache(maxsize=1024, ttl=settings.llm_response_cache_ttl)
+            if settings.llm_response_cache_ttl > 0
+            else None
+        )
+
     async def generate_json(
         self,
         system_prompt: str,
@@ -83,6 +94,17 @@ class OpenRouterService:
             # Request JSON mode without strict schema
             payload["response_format"] = {"type": "json_object"}
 
+        cache_key = None
+        if self._json_cache is not None:
+            cache_key = hashlib.blake2b(
+                orjson.dumps(payload, option=orjson.OPT_SORT_KEYS), digest_size=16
+            ).digest()
+            cached = self._json_cache.get(cache_key)
+            if cached is not None:
+                logger.debug("[LLM] generate_json cache hit")
+                # Re-parse so callers never share a mutable result
+                return self._parse_json_content(cached)
+
         async with httpx.AsyncClient(timeout=60.0) as client:
             response = await client.post(
                 self.BASE_URL,
@@ -95,7 +117,14 @@ class OpenRouterService:
         # Extract content from response
         content = data["choices"][0]["message"]["content"]
 
-        # Parse JSON from content
+        result = self._parse_json_content(content)
+        if cache_key is not None:
+            self._json_cache[cache_key] = content
+        return result
+
+    @staticmethod
+    def _parse_json_content(content: str) -> dict[str, Any]:
+        """Parse JSON from LLM message content (optionally inside a code block)"""
         try:
             return json.loads(content)
         except json.JSONDecodeError as e:
@@ -2,7 +2,9 @@
 
 from string import Template
 
-from ..models.user_preference import UserPreference
+from cachetools import LRUCache
+
+from ..models.user_preference import SKILL_CATEGORY_VALUES, UserPreference
 
 
 class PromptService:
@@ -97,6 +99,30 @@ Respond with ONLY the JSON array, no additional text or explanation."""
 
     def __init__(self):
         self.user_template = Template(self.USER_PROMPT_TEMPLATE)
+        self.issue_ranking_template = Template(self.ISSUE_RANKING_PROMPT_TEMPLATE)
+        # Formatted preference sections per (user_id, updated_at); a preference
+        # update bumps updated_at, so stale entries are simply never hit again
+        self._sections_cache: LRUCache = LRUCache(maxsize=1024)
+
+    def _preference_sections(self, user_preference: UserPreference) -> dict[str, str]:
+        """Format (or reuse) the prompt sections derived from a user's preferences"""
+        key = (user_preference.user_id, user_preference.updated_at)
+        sections = self._sections_cache.get(key)
+        if sections is None:
+            sections = {
+                "languages": self._format_languages(user_preference.languages),
+                "skills": self._format_skills(user_preference.skills),
+                "skill_level": self._get_overall_skill_level(user_preference.skills),
+                "project_interests": self._format_project_interests(
+                    user_preference.project_interests
+                ),
+                "issue_interests": self._format_issue_interests(
+                    user_preference.issue_interests
+                ),
+            }
+            if user_preference.updated_at is not None:
+                self._sections_cache[key] = sections
+        return sections
 
     def build_recommendation_prompt(
         self,
@@ -119,14 +145,11 @@ Respond with ONLY the JSON array, no additional text or explanation."""
         """
         # Format user preferences or use defaults
         if user_preference:
-            languages = self._format_languages(user_preference.languages)
-            skills = self._format_skills(user_preference.skills)
-            project_interests = self._format_project_interests(
-                user_preference.project_interests
-            )
-            issue_interests = self._format_issue_interests(
-                user_preference.issue_interests
-            )
+            sections = self._preference_sections(user_preference)
+            languages = sections["languages"]
+            skills = sections["skills"]
+            project_interests = sections["project_interests"]
+            issue_interests = sections["issue_interests"]
         else:
             languages = "No specific preference (recommend popular languages)"
             skills = (
@@ -173,7 +196,7 @@ Respond with ONLY the JSON array, no additional text or explanation."""
         for skill in skills:
             name = skill.get("name", "unknown")
             familiarity = skill.get("familiarity", "beginner")
-            category = skill.get("category", "other")
+            category = SKILL_CATEGORY_VALUES.get(name, "other")
 
             skill_str = f"{name} ({category})"
             if familiarity in familiarity_groups:
@@ -380,11 +403,10 @@ Return up to $limit issues. You MUST include at least 3 issues in your response.
         """
         # Format user preferences or use defaults
         if user_preference:
-            skill_level = self._get_overall_skill_level(user_preference.skills)
-            skills = self._format_skills(user_preference.skills)
-            issue_interests = self._format_issue_interests(
-                user_preference.issue_interests
-            )
+            sections = self._preference_sections(user_preference)
+            skill_level = sections["skill_level"]
+            skills = sections["skills"]
+            issue_interests = sections["issue_interests"]
         else:
             skill_level = "BEGINNER (default - no skills specified)"
             skills = "No specific skills provided"
@@ -402,10 +424,7 @@ Return up to $limit issues. You MUST include at least 3 issues in your response.
         issues_text = "\n".join(issues_list) if issues_list else "No issues provided"
 
         # Substitute template variables
-        from string import Template
-
-        user_template = Template(self.ISSUE_RANKING_PROMPT_TEMPLATE)
-        user_prompt = user_template.substitute(
+        user_prompt = self.issue_ranking_template.substitute(
             repo_name=repo_name,
             skill_level=skill_level,
             skills=skills,
@@ -1,13 +1,11 @@
 """Repository Service - LLM-based Repo Recommendation Logic"""
 
 import logging
-from uuid import UUID
 
 from pydantic import ValidationError
-from supabase import Client
 
-from ..dao.user_preference_dao import UserPreferenceDAO
-from ..dto.repo_dto import RepoDTO, RepoRecommendQueryDTO
+from ..dto.repo_dto import REPO_VALIDATOR, RepoDTO, RepoRecommendQueryDTO
+from ..models.user_preference import UserPreference
 from .github_service import GitHubService
 from .openrouter_service import OpenRouterService
 from .prompt_service import PromptService
@@ -70,13 +68,10 @@ class RepoService:
     def __init__(
         self,
         github_service: GitHubService,
-        supabase: Client,
         openrouter_service: OpenRouterService | None = None,
         prompt_service: PromptService | None = None,
     ):
         self.github_service = github_service
-        self.supabase = supabase
-        self.user_preference_dao = UserPreferenceDAO(supabase)
         self.openrouter_service = openrouter_service
         self.prompt_service = prompt_service or PromptService()
 
@@ -142,7 +137,7 @@ class RepoService:
 
     async def recommend_repos(
         self,
-        user_id: UUID,
+        user_preference: UserPreference | None,
         query: RepoRecommendQueryDTO | None = None,
     ) -> list[RepoDTO]:
         """
@@ -151,15 +146,12 @@ class RepoService:
         Falls back to GitHub API search if LLM is not available or fails.
 
         Args:
-            user_id: The user's ID (from Supabase auth)
+            user_preference: The user's preferences (None if not onboarded)
             query: Optional query parameters for filtering
 
         Returns:
             List of recommended repositories
         """
-        # Get user preferences
-        user_preference = self.user_preference_dao.get_by_user_id(user_id)
-
         # Get query parameters
         limit = query.limit if query else 10
         min_stars = query.min_stars if query else 100
@@ -295,17 +287,19 @@ class RepoService:
         for item in repo_data:
             try:
                 # Validate and create RepoDTO
-                repo = RepoDTO(
-                    id=item.get("id", 0),
-                    name=item.get("name", ""),
-                    full_name=item.get("full_name", ""),
-                    url=item.get("url", ""),
-                    description=item.get("description"),
-                    language=item.get("language", "Unknown"),
-                    stars=item.get("stars", 0),
-                    open_issues_count=item.get("open_issues_count", 0),
-                    topics=item.get("topics", []),
-                    good_first_issue_count=item.get("good_first_issue_count", 0),
+                repo = REPO_VALIDATOR.validate_python(
+                    {
+                        "id": item.get("id", 0),
+                        "name": item.get("name", ""),
+                        "full_name": item.get("full_name", ""),
+                        "url": item.get("url", ""),
+                        "description": item.get("description"),
+                        "language": item.get("language", "Unknown"),
+                        "stars": item.get("stars", 0),
+                        "open_issues_count": item.get("open_issues_count", 0),
+                        "topics": item.get("topics", []),
+                        "good_first_issue_count": item.get("good_first_issue_count", 0),
+                    }
                 )
                 repos.append(repo)
             except ValidationError as e:
@@ -401,7 +395,7 @@ class RepoService:
         """
         Map skills to GitHub topics.
 
-        Skills are structured objects with name, category, and familiarity.
+        Skills are structured objects with name and familiarity.
         We prioritize skills with higher familiarity levels.
         """
         skill_topic_map = {
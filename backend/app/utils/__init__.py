@@ -1,6 +1,8 @@
 """Utility Functions Package"""
 
-from .dependencies import get_current_user, get_db, get_supabase
-from .supabase_client import get_supabase_client
+from .supabase_client import get_async_supabase_client, get_supabase_client
 
-__all__ = ["get_current_user", "get_db", "get_supabase", "get_supabase_client"]
+__all__ = [
+    "get_async_supabase_client",
+    "get_supabase_client",
+]
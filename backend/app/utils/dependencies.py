@@ -1,16 +1,31 @@
 """FastAPI Dependencies"""
 
+import hashlib
+import logging
+import time
 from collections.abc import Generator
-from typing import Annotated
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Annotated, TypedDict
+from uuid import UUID
 
-from fastapi import Depends, HTTPException, status
+from cachetools import TLRUCache
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from jose import jwt
 from sqlalchemy import create_engine
 from sqlalchemy.orm import Session, sessionmaker
-from supabase import Client
+from supabase import AsyncClient
 
 from ..config import get_settings
-from .supabase_client import get_supabase_client
+from ..dao.user_preference_dao import UserPreferenceDAO
+from ..models.user_preference import UserPreference
+from ..services.github_service import GitHubService
+from ..services.openrouter_service import OpenRouterService
+from ..services.prompt_service import PromptService
+from .supabase_client import get_async_supabase_client
+
+logger = logging.getLogger(__name__)
 
 # Security scheme
 security = HTTPBearer()
@@ -26,7 +41,15 @@ def _get_engine():
     if _engine is None:
         settings = get_settings()
         if settings.database_url:
-            _engine = create_engine(settings.database_url, pool_pre_ping=True)
+            # Sized for Supabase's pooler: a fixed pool, no overflow bursts, and
+            # connections recycled before the pooler drops idle ones
+            _engine = create_engine(
+                settings.database_url,
+                pool_size=20,
+                max_overflow=0,
+                pool_pre_ping=True,
+                pool_recycle=300,
+            )
     return _engine
 
 
@@ -61,10 +84,14 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
-def get_supabase() -> Client:
-    """Get Supabase client dependency"""
+async def get_supabase(request: Request) -> AsyncClient:
+    """Get Supabase client dependency (the process-wide client built at startup)"""
+    supabase = getattr(request.app.state, "supabase", None)
+    if supabase is not None:
+        return supabase
+
     try:
-        return get_supabase_client()
+        return await get_async_supabase_client()
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -72,29 +99,147 @@ def get_supabase() -> Client:
         )
 
 
+@lru_cache
+def _get_default_github_service() -> GitHubService:
+    """GitHubService with per-call HTTP clients, for when the lifespan did not run"""
+    return GitHubService()
+
+
+def get_github_service(request: Request) -> GitHubService:
+    """Get the GitHubService built at startup (bound to the shared HTTP/2 pool)"""
+    service = getattr(request.app.state, "github_service", None)
+    return service if service is not None else _get_default_github_service()
+
+
+@lru_cache
+def get_prompt_service() -> PromptService:
+    """Get cached PromptService instance"""
+    return PromptService()
+
+
+@lru_cache
+def get_optional_openrouter_service() -> OpenRouterService | None:
+    """
+    Get the process-wide OpenRouterService, or None if no API key is configured.
+
+    Shared by the issue/repo ranking routes and the agent. The result,
+    including None, is cached, so a missing key is not re-checked per request.
+    """
+    settings = get_settings()
+    if settings.openrouter_api_key:
+        try:
+            return OpenRouterService()
+        except ValueError as e:
+            logger.warning("Failed to initialize OpenRouter service: %s", e)
+    return None
+
+
+async def get_openrouter_service(request: Request) -> OpenRouterService | None:
+    """
+    Get the OpenRouterService resolved at startup (None when LLM ranking is off).
+
+    A plain attribute read, so the no-LLM path costs nothing per request; async
+    so FastAPI does not dispatch it to the threadpool.
+    """
+    state = request.app.state
+    if hasattr(state, "openrouter_service"):
+        return state.openrouter_service
+    # Lifespan did not run (e.g. tests)
+    return get_optional_openrouter_service()
+
+
+_HYPHENS = str.maketrans("", "", "-")
+
+
+@lru_cache(maxsize=10_000)
+def parse_uuid(value: str) -> UUID:
+    """
+    Parse a user id string into a UUID.
+
+    Supabase returns canonical 8-4-4-4-12 ids, which are decoded straight from
+    hex; anything else goes through the generic UUID() parser.
+    """
+    if len(value) == 36 and value[8] == value[13] == value[18] == value[23] == "-":
+        try:
+            return UUID(bytes=bytes.fromhex(value.translate(_HYPHENS)))
+        except ValueError:
+            pass
+    return UUID(value)
+
+
+# Verified users are cached per token (keyed by its SHA-256, never the raw token)
+# so bursts of authenticated requests skip the Supabase auth round-trip. The
+# cache is per worker and logout only evicts in the worker that handled it, so
+# the TTL is kept short: a revoked token is accepted elsewhere for at most this.
+USER_CACHE_TTL_SECONDS = 5
+
+_user_cache: TLRUCache = TLRUCache(
+    maxsize=10_000,
+    ttu=lambda _key, entry, now: min(now + USER_CACHE_TTL_SECONDS, entry[1]),
+    timer=time.time,
+)
+_user_cache_stats = {"hits": 0, "misses": 0}
+
+
+def _token_cache_key(token: str) -> str:
+    """Hash a bearer token for use as a cache key"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def invalidate_cached_user(token: str) -> None:
+    """Forget a verified token (e.g. on logout) so it is re-checked next time"""
+    _user_cache.pop(_token_cache_key(token), None)
+
+
+def get_user_cache_stats() -> dict:
+    """Get hit/miss counters and current size of the verified-user cache"""
+    return {**_user_cache_stats, "size": len(_user_cache)}
+
+
+class AuthenticatedUser(TypedDict):
+    """The verified user returned by get_current_user"""
+
+    id: UUID
+    email: str | None
+    created_at: str | None
+
+
 async def get_current_user(
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
-    supabase: Annotated[Client, Depends(get_supabase)],
-) -> dict:
-    """Get current authenticated user from JWT token"""
+    supabase: Annotated[AsyncClient, Depends(get_supabase)],
+) -> AuthenticatedUser:
+    """
+    Get current authenticated user from JWT token.
+
+    The user id is parsed into a UUID once here so handlers can use it directly.
+    Verified tokens are cached for up to USER_CACHE_TTL_SECONDS (never past
+    their own exp claim) to avoid a Supabase round-trip on every request.
+    """
     token = credentials.credentials
+    cache_key = _token_cache_key(token)
+
+    cached = _user_cache.get(cache_key)
+    if cached is not None:
+        _user_cache_stats["hits"] += 1
+        return AuthenticatedUser(**cached[0])
+    _user_cache_stats["misses"] += 1
 
     try:
         # Verify token with Supabase
-        user_response = supabase.auth.get_user(token)
+        user_response = await supabase.auth.get_user(token)
         if user_response.user is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid or expired token",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-        return {
-            "id": user_response.user.id,
-            "email": user_response.user.email,
-            "created_at": str(user_response.user.created_at)
+        user = AuthenticatedUser(
+            id=parse_uuid(user_response.user.id),
+            email=user_response.user.email,
+            created_at=str(user_response.user.created_at)
             if user_response.user.created_at
             else None,
-        }
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -102,8 +247,69 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    # Never keep a token cached past its own expiry
+    try:
+        exp = float(jwt.get_unverified_claims(token)["exp"])
+    except Exception:
+        exp = 0.0
+    if exp > time.time():
+        _user_cache[cache_key] = (user, exp)
+
+    return user
+
 
 # Type aliases for dependency injection
 DBSession = Annotated[Session, Depends(get_db)]
-SupabaseClient = Annotated[Client, Depends(get_supabase)]
-CurrentUser = Annotated[dict, Depends(get_current_user)]
+SupabaseClient = Annotated[AsyncClient, Depends(get_supabase)]
+CurrentUser = Annotated[AuthenticatedUser, Depends(get_current_user)]
+GitHubServiceDep = Annotated[GitHubService, Depends(get_github_service)]
+PromptServiceDep = Annotated[PromptService, Depends(get_prompt_service)]
+OpenRouterServiceDep = Annotated[
+    OpenRouterService | None, Depends(get_openrouter_service)
+]
+
+
+@dataclass(slots=True)
+class AuthedContext:
+    """
+    Per-request bundle of the authenticated user, the Supabase client and the
+    user's preferences.
+
+    The preferences are fetched on first use and then reused, so every
+    consumer in a request shares a single lookup; routes that never need them
+    never pay for it.
+    """
+
+    user_id: UUID
+    supabase: AsyncClient
+    _preference: UserPreference | None = field(default=None, repr=False)
+    _preference_loaded: bool = field(default=False, repr=False)
+
+    async def get_preference(
+        self, *, allow_cached: bool = False
+    ) -> UserPreference | None:
+        """
+        Get the user's preferences (None if onboarding is not complete).
+
+        With allow_cached, a per-worker cached row (possibly a few seconds
+        stale, without the GitHub token) may be returned; see
+        UserPreferenceDAO.get_by_user_id. Only the fresh row is kept for reuse.
+        """
+        if self._preference_loaded:
+            return self._preference
+        dao = UserPreferenceDAO(self.supabase)
+        if allow_cached:
+            return await dao.get_by_user_id(self.user_id, allow_cached=True)
+        self._preference = await dao.get_by_user_id(self.user_id)
+        self._preference_loaded = True
+        return self._preference
+
+
+async def get_authed_context(
+    current_user: CurrentUser, supabase: SupabaseClient
+) -> AuthedContext:
+    """Build the AuthedContext for the current request"""
+    return AuthedContext(user_id=current_user["id"], supabase=supabase)
+
+
+AuthedContextDep = Annotated[AuthedContext, Depends(get_authed_context)]
@@ -0,0 +1,35 @@
+"""JSON Response Helpers"""
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+
+def json_list_response(adapter: TypeAdapter, items: list[BaseModel]) -> Response:
+    """
+    Serialize a list of models to a JSON array in one pass.
+
+    pydantic-core writes the bytes directly, skipping FastAPI's
+    response_model re-validation and the intermediate jsonable dicts. The
+    route should keep its response_model for the OpenAPI schema.
+    """
+    return Response(adapter.dump_json(items), media_type="application/json")
+
+
+def json_model_response(
+    model: BaseModel,
+    status_code: int = 200,
+    headers: dict[str, str] | None = None,
+) -> Response:
+    """
+    Serialize a single model with pydantic-core, like json_list_response.
+
+    FastAPI would otherwise dump the model, re-validate it against the
+    response_model field and encode it again on every request. Headers set on
+    an injected Response are not carried over, so pass them here.
+    """
+    return Response(
+        model.model_dump_json(),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )
@@ -2,7 +2,7 @@
 
 from functools import lru_cache
 
-from supabase import Client, create_client
+from supabase import AsyncClient, Client, acreate_client, create_client
 
 from ..config import get_settings
 
@@ -19,3 +19,24 @@ def get_supabase_client() -> Client:
         )
 
     return create_client(settings.supabase_url, settings.supabase_key)
+
+
+_async_client: AsyncClient | None = None
+
+
+async def get_async_supabase_client() -> AsyncClient:
+    """Get the shared async Supabase client (created once per process)"""
+    global _async_client
+    if _async_client is None:
+        settings = get_settings()
+
+        if not settings.supabase_url or not settings.supabase_key:
+            raise ValueError(
+                "Supabase is not configured. Please set SUPABASE_URL and SUPABASE_KEY "
+                "environment variables or in .env file."
+            )
+
+        _async_client = await acreate_client(
+            settings.supabase_url, settings.supabase_key
+        )
+    return _async_client
@@ -0,0 +1,18 @@
+"""URL Helpers"""
+
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1024)
+def normalize_repo_url(v: str) -> str:
+    """
+    Strip a repository URL and give it an https:// scheme if it has none.
+
+    Scheme-relative URLs (//github.com/...) are covered too. Every DTO that
+    accepts a repo_url goes through here so one repository always yields the
+    same cache keys.
+    """
+    v = v.strip()
+    if not v[:8].lower().startswith(("http://", "https://")):
+        v = "https://" + v.lstrip("/")
+    return v
@@ -0,0 +1,27 @@
+-- Migration: Add acquire_agent_session() for single round-trip session access
+-- Run this in Supabase SQL Editor
+--
+-- Session-bound endpoints used to fetch the session, check ownership in Python,
+-- then issue one or two follow-up UPDATEs (last_accessed_at, status).
+-- This function does the ownership/expiry check, TTL refresh and optional
+-- status change in one statement and returns the updated row.
+-- An empty result means the session is missing, owned by another user or expired.
+
+CREATE OR REPLACE FUNCTION acquire_agent_session(
+    p_session_id UUID,
+    p_user_id UUID,
+    p_status TEXT DEFAULT NULL
+)
+RETURNS SETOF agent_sessions
+LANGUAGE sql
+AS $$
+    UPDATE agent_sessions
+    SET last_accessed_at = NOW(),
+        status = COALESCE(p_status, status)
+    WHERE id = p_session_id
+      AND user_id = p_user_id
+      AND expires_at > NOW()
+    RETURNING *;
+$$;
+
+COMMENT ON FUNCTION acquire_agent_session(UUID, UUID, TEXT) IS 'Authorize, touch (reset TTL) and optionally set status of an agent session in one call';
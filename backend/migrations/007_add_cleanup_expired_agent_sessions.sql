@@ -0,0 +1,20 @@
+-- Migration: Add cleanup_expired_agent_sessions() for server-side session cleanup
+-- Run this in Supabase SQL Editor
+--
+-- Cleanup used to DELETE ... RETURNING every expired row through PostgREST just
+-- to count them in Python. This function deletes and counts in one statement,
+-- so no row data crosses the network.
+
+CREATE OR REPLACE FUNCTION cleanup_expired_agent_sessions()
+RETURNS INTEGER
+LANGUAGE sql
+AS $$
+    WITH deleted AS (
+        DELETE FROM agent_sessions
+        WHERE expires_at < NOW()
+        RETURNING 1
+    )
+    SELECT COUNT(*)::INTEGER FROM deleted;
+$$;
+
+COMMENT ON FUNCTION cleanup_expired_agent_sessions() IS 'Delete expired agent sessions and return how many were removed';
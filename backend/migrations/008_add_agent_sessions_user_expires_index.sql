@@ -0,0 +1,12 @@
+-- Migration: Add composite (user_id, expires_at) index on agent_sessions
+-- Run this in Supabase SQL Editor
+--
+-- count_by_user() counts a user's unexpired sessions with a HEAD request
+-- (no rows returned). This index lets Postgres answer that count with an
+-- index-only scan. It also serves every plain user_id lookup, so the
+-- single-column user_id index is redundant and dropped.
+
+CREATE INDEX IF NOT EXISTS idx_agent_sessions_user_id_expires_at
+    ON agent_sessions(user_id, expires_at);
+
+DROP INDEX IF EXISTS idx_agent_sessions_user_id;
@@ -0,0 +1,18 @@
+-- Migration: Schedule expired agent session cleanup with pg_cron
+-- Run this in Supabase SQL Editor
+--
+-- Expired sessions used to be removed only when someone called
+-- POST /agent/sessions/cleanup. pg_cron now runs the delete inside the
+-- database every 5 minutes, using cleanup_expired_agent_sessions() from
+-- migration 007. The endpoint stays available for on-demand cleanup.
+-- The delete filters on expires_at alone, which idx_agent_sessions_expires_at
+-- (migration 001) already covers.
+
+CREATE EXTENSION IF NOT EXISTS pg_cron;
+
+-- Scheduling under an existing job name replaces that job, so this is safe to re-run
+SELECT cron.schedule(
+    'cleanup-agent-sessions',
+    '*/5 * * * *',
+    $$SELECT cleanup_expired_agent_sessions()$$
+);
@@ -0,0 +1,11 @@
+-- Migration: Add GIN (jsonb_path_ops) index on user_preferences.skills
+-- Run this in Supabase SQL Editor
+--
+-- Lets containment lookups on skills use an index instead of a sequential scan:
+--   WHERE skills @> '[{"name": "python", "familiarity": "advanced"}]'
+-- jsonb_path_ops only supports @> (not key-existence operators), which is all
+-- skill matching needs, and yields a smaller index than the default opclass.
+-- On a large table, run it as CREATE INDEX CONCURRENTLY on its own instead.
+
+CREATE INDEX IF NOT EXISTS idx_user_preferences_skills
+    ON public.user_preferences USING GIN (skills jsonb_path_ops);
@@ -0,0 +1,17 @@
+-- Migration: Add GIN indexes on user_preferences array columns
+-- Run this in Supabase SQL Editor
+--
+-- Lets interest/language matching across users use an index instead of a
+-- sequential scan, with either operator:
+--   WHERE project_interests && ARRAY['llm', 'ml']    -- any of (overlap)
+--   WHERE project_interests @> ARRAY['llm', 'ml']    -- all of (contains)
+-- On a large table, run each as CREATE INDEX CONCURRENTLY on its own instead.
+
+CREATE INDEX IF NOT EXISTS idx_user_preferences_languages
+    ON public.user_preferences USING GIN (languages);
+
+CREATE INDEX IF NOT EXISTS idx_user_preferences_project_interests
+    ON public.user_preferences USING GIN (project_interests);
+
+CREATE INDEX IF NOT EXISTS idx_user_preferences_issue_interests
+    ON public.user_preferences USING GIN (issue_interests);
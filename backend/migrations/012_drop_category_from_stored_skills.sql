@@ -0,0 +1,20 @@
+-- Migration: Drop the derived category key from stored skills
+-- Run this in Supabase SQL Editor
+--
+-- A skill's category is fully determined by its name (SKILL_CATEGORY_MAP), so
+-- the backend now stores only {name, familiarity} and derives category on read.
+-- This rewrites existing rows to match, shrinking each skills payload.
+-- Run it after deploying the backend that derives categories: older builds
+-- still read category from the stored skill.
+
+UPDATE public.user_preferences
+SET skills = (
+    SELECT COALESCE(jsonb_agg(s.elem - 'category' ORDER BY s.ord), '[]'::jsonb)
+    FROM jsonb_array_elements(skills) WITH ORDINALITY AS s(elem, ord)
+)
+WHERE jsonb_typeof(skills) = 'array'
+  AND EXISTS (
+      SELECT 1 FROM jsonb_array_elements(skills) AS e(elem) WHERE e.elem ? 'category'
+  );
+
+COMMENT ON COLUMN public.user_preferences.skills IS 'List of Skill objects with name, familiarity (category derived from name)';
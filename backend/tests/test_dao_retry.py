@@ -0,0 +1,95 @@
+"""Tests for the Supabase retry helpers in app.dao.base"""
+
+import httpx
+import pytest
+from supabase import PostgrestAPIError
+
+from app.dao import base
+from app.dao.base import _is_retryable, execute_with_retry
+
+
+def api_error(code: str) -> PostgrestAPIError:
+    return PostgrestAPIError({"message": "failed", "code": code})
+
+
+class FakeQuery:
+    """Query stand-in that raises the given errors, then succeeds"""
+
+    def __init__(self, *errors: Exception):
+        self.errors = list(errors)
+        self.calls = 0
+        self.retry_enabled = True
+
+    def retry(self, enabled: bool) -> "FakeQuery":
+        self.retry_enabled = enabled
+        return self
+
+    async def execute(self) -> str:
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(base, "RETRY_INITIAL_DELAY", 0)
+
+
+@pytest.mark.parametrize("code", ["429", "503", "PGRST000", "PGRST003"])
+@pytest.mark.parametrize("idempotent", [True, False])
+def test_unprocessed_errors_are_always_retryable(code, idempotent):
+    assert _is_retryable(api_error(code), idempotent)
+
+
+@pytest.mark.parametrize("code", ["500", "502", "504", "520"])
+def test_ambiguous_errors_are_retryable_only_when_idempotent(code):
+    assert _is_retryable(api_error(code), idempotent=True)
+    assert not _is_retryable(api_error(code), idempotent=False)
+
+
+@pytest.mark.parametrize("code", ["400", "404", "23505", "PGRST116"])
+def test_client_errors_are_not_retryable(code):
+    assert not _is_retryable(api_error(code), idempotent=True)
+
+
+def test_transport_errors():
+    request = httpx.Request("GET", "https://example.supabase.co")
+    not_sent = httpx.ConnectError("refused", request=request)
+    mid_request = httpx.ReadTimeout("timed out", request=request)
+
+    assert _is_retryable(not_sent, idempotent=False)
+    assert _is_retryable(mid_request, idempotent=True)
+    assert not _is_retryable(mid_request, idempotent=False)
+    assert not _is_retryable(ValueError("not a Supabase error"), idempotent=True)
+
+
+async def test_retries_transient_errors_then_succeeds():
+    query = FakeQuery(api_error("503"), api_error("502"))
+
+    assert await execute_with_retry(query) == "ok"
+    assert query.calls == 3
+    assert not query.retry_enabled
+
+
+async def test_non_idempotent_query_is_not_retried_on_ambiguous_error():
+    query = FakeQuery(api_error("502"))
+
+    with pytest.raises(PostgrestAPIError):
+        await execute_with_retry(query, idempotent=False)
+    assert query.calls == 1
+
+
+async def test_non_idempotent_query_is_retried_when_never_processed():
+    query = FakeQuery(api_error("429"))
+
+    assert await execute_with_retry(query, idempotent=False) == "ok"
+    assert query.calls == 2
+
+
+async def test_gives_up_after_retry_attempts():
+    query = FakeQuery(*(api_error("503") for _ in range(base.RETRY_ATTEMPTS)))
+
+    with pytest.raises(PostgrestAPIError):
+        await execute_with_retry(query)
+    assert query.calls == base.RETRY_ATTEMPTS
@@ -124,7 +124,6 @@ export type IssueInterest =
 export interface SkillInputDTO {
   name: SkillName;
   familiarity: Familiarity;
-  category?: SkillCategory;
 }
 
 export interface SkillDTO {